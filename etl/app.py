@@ -1,48 +1,116 @@
 import os
 import sys
+import copy
 import uuid
 import time
 import threading
+import atexit
 import logging
 import subprocess
-import pyodbc
+import tempfile
+import multiprocessing as mp
+from collections import namedtuple
+import functools
+from functools import wraps
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 import traceback  # add this at the top if you still want tracebacks logged
 
 import yaml
-from flask import Flask, render_template, request, jsonify, session
+try:
+    # libyaml-backed emitter; falls back to pure Python when unavailable
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeDumper
+from datetime import datetime
+from flask import Flask, Response, make_response, render_template, request, jsonify, session, g
+from flask.json.provider import DefaultJSONProvider
+from jinja2 import FileSystemBytecodeCache
+from werkzeug.utils import secure_filename
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.executors.pool import ThreadPoolExecutor as APSThreadPoolExecutor
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
-from comprehensive_logging import comprehensive_logger
-from view_details_database import list_all_databases, get_database_details
-from database_status import check_all_databases
 from auth import init_auth, login_required
 from manage_server import manage_server_bp  # Blueprint
+from cache import cache, page_cache_key
+import config_cache
+from connections import build_conn_str, get_conn, close_all as close_sql_pools
+
+# ---------------- Paths ----------------
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+HYBRID_SYNC_PATH = os.path.join(BASE_DIR, "hybrid_sync.py")
+CONFIG_CANDIDATES = (
+    os.path.normpath(os.path.join(BASE_DIR, "../config/db_connections.yaml")),
+    os.path.join(BASE_DIR, "config/db_connections.yaml"),
+    r"C:\Nitin_sir\config\db_connections.yaml",
+)
+
+try:
+    import orjson
+except ImportError:  # optional speed-up, stdlib json is used without it
+    orjson = None
+
+# ---------------- JSON ----------------
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify() backed by orjson; falls back to Flask's encoder for unknown types."""
+    option = orjson.OPT_NON_STR_KEYS if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        # Hand the bytes straight to the response, no str round-trip
+        body = orjson.dumps(obj, default=self.default, option=self.option)
+        return self._app.response_class(body, mimetype=self.mimetype)
 
 # ---------------- Flask App ----------------
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 init_auth(app)
+cache.init_app(app)
+# Compiled templates persist on disk, so restarts and new workers skip the Jinja compile
+JINJA_CACHE_DIR = os.environ.get("JINJA_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "etl-jinja-cache")
+os.makedirs(JINJA_CACHE_DIR, exist_ok=True)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(JINJA_CACHE_DIR)
 
 # ---------------- Logging ----------------
 logging.basicConfig(level=logging.DEBUG, format="%(asctime)s [%(levelname)s] %(message)s")
 
 # ---------------- In-memory schedule storage ----------------
+# Copy-on-write: writers swap in a new dict under `lock`, readers just grab the reference
 schedules = {}      # job_id -> schedule info
-stop_flags = {}     # job_id -> stop signal
-lock = threading.Lock()  # For thread-safe schedule manipulation
+lock = threading.Lock()  # Serialises schedule writers only
+
+# One background dispatcher thread keeps every schedule ordered by next fire time
+# (APScheduler, as in scheduler.py) and hands due runs to a small worker pool,
+# so a long sync never delays the others. Started by init_app().
+# A run missed by up to an hour (suspend, busy workers) still fires once, late.
+JOB_MISFIRE_GRACE = int(os.environ.get("JOB_MISFIRE_GRACE", 3600))
+scheduler = BackgroundScheduler(
+    executors={"default": APSThreadPoolExecutor(int(os.environ.get("SCHEDULER_WORKERS", 4)))},
+    job_defaults={"coalesce": True, "max_instances": 1, "misfire_grace_time": JOB_MISFIRE_GRACE},
+)
 
 # ---------------- Context Processor ----------------
+@app.before_request
+def load_user_role():
+    # Read the session once per request; every template render reuses it
+    g.current_role = session.get("role")
+
 @app.context_processor
 def inject_user_role():
-    return {"current_role": session.get("role")}
+    return {"current_role": getattr(g, "current_role", None)}
 
 # ---------------- Config Loader ----------------
 def resolve_config_path():
-    candidates = [
-        os.environ.get("DB_CONFIG_PATH"),
-        os.path.join(os.path.dirname(__file__), "../config/db_connections.yaml"),
-        os.path.join(os.path.dirname(__file__), "config/db_connections.yaml"),
-        r"C:\Nitin_sir\config\db_connections.yaml",
-    ]
-    for p in candidates:
+    for p in (os.environ.get("DB_CONFIG_PATH"),) + CONFIG_CANDIDATES:
         if p and os.path.exists(p):
             logging.debug(f"Config file found: {p}")
             return p
@@ -50,81 +118,270 @@ def resolve_config_path():
 
 CONFIG_PATH = resolve_config_path()
 
+# Read-only view of one parse of the YAML, shared by requests and job threads
+ServerConf = namedtuple("ServerConf", "name server username password conn_str raw")
+ConfigSnapshot = namedtuple("ConfigSnapshot", "mtime size sqlservers postgresql raw")
+
+def _build_snapshot(parsed, mtime, size) -> ConfigSnapshot:
+    servers = parsed.get("sqlservers") or {}
+    # Connection strings live on the snapshot so they never get saved back to YAML
+    sqlservers = {
+        name: ServerConf(
+            name=name,
+            server=(conf or {}).get("server", "localhost"),
+            username=(conf or {}).get("username", "sa"),
+            password=(conf or {}).get("password", "root"),
+            conn_str=build_conn_str(conf or {}),
+            raw=MappingProxyType(conf or {}),
+        )
+        for name, conf in servers.items()
+    }
+    return ConfigSnapshot(
+        mtime=mtime,
+        size=size,
+        sqlservers=MappingProxyType(sqlservers),
+        postgresql=MappingProxyType(parsed.get("postgresql") or {}),
+        raw=MappingProxyType(parsed),
+    )
+
+def get_config() -> ConfigSnapshot:
+    """Current config snapshot, rebuilt only when the file changes (see config_cache). Do not mutate."""
+    return config_cache.get_derived(CONFIG_PATH, _build_snapshot)
+
 def load_config():
-    with open(CONFIG_PATH, "r") as f:
-        return yaml.safe_load(f) or {}
+    """Return a mutable copy of the parsed YAML config (for edit + save_config)."""
+    return copy.deepcopy(dict(get_config().raw))
+
+def get_conn_str(server_name):
+    """Pre-built connection string for a configured server (None if unknown)."""
+    srv = get_config().sqlservers.get(server_name)
+    return srv.conn_str if srv else None
 
 def save_config(config):
     with open(CONFIG_PATH, "w") as f:
-        yaml.safe_dump(config, f, default_flow_style=False)
+        yaml.dump(config, f, Dumper=SafeDumper, default_flow_style=False)
+    # mtime granularity can hide a same-size rewrite, so drop the cache explicitly
+    config_cache.invalidate()
     logging.info("Config saved successfully.")
 
-# Ensure 'sqlservers' section exists
-config = load_config()
-if "sqlservers" not in config:
-    config["sqlservers"] = {}
-    save_config(config)
+# ---------------- SQL Server Connection Pool ----------------
+def warm_connections():
+    """Open one connection per configured server so the first request skips driver load + TLS."""
+    for server_name, srv in get_config().sqlservers.items():
+        start = time.monotonic()
+        try:
+            with get_conn(server_name, srv.conn_str) as conn:
+                conn.cursor().execute("SELECT 1").fetchall()
+            logging.info(f"[WARMUP] {server_name} ready in {time.monotonic() - start:.2f}s")
+        except Exception as e:
+            logging.warning(f"[WARMUP] {server_name} failed after {time.monotonic() - start:.2f}s: {e}")
 
 # ---------------- SQL Server Helper ----------------
-def get_sql_servers_and_databases() -> dict:
-    config = load_config()
-    servers = config.get("sqlservers", {})
-    result = {}
-    for server_name, conf in servers.items():
-        server_host = conf.get("server", "localhost")
-        username = conf.get("username", "sa")
-        password = conf.get("password", "root")
+# Database lists change rarely; cache them per server for DB_LIST_TTL seconds.
+# The up/down status on the index page is allowed to be at most STATUS_TTL old.
+DB_LIST_TTL = float(os.environ.get("DB_LIST_TTL", 60))
+STATUS_TTL = float(os.environ.get("STATUS_TTL", 5))
+_db_list_cache = {}      # server_name -> (monotonic fetch time, [(database, state_desc)])
+
+# One string per server instead of a Row object per database (SQL Server 2017+).
+# \x1f separates name from state and \x1e separates databases; neither shows up in names.
+_DB_STATES_AGG_SQL = """
+    SELECT STRING_AGG(CAST(name AS NVARCHAR(MAX)) + NCHAR(31) + state_desc, NCHAR(30))
+           WITHIN GROUP (ORDER BY name)
+    FROM sys.databases
+    WHERE name NOT IN ('master', 'tempdb', 'model', 'msdb')
+"""
+_DB_STATES_SQL = """
+    SELECT name, state_desc
+    FROM sys.databases 
+    WHERE name NOT IN ('master', 'tempdb', 'model', 'msdb')
+    ORDER BY name
+"""
+_no_string_agg = set()   # servers older than 2017, which lack STRING_AGG
+
+def _fetch_database_states(conn, server_name):
+    """[(database, state_desc)] for the user databases on one server."""
+    import pyodbc  # already loaded by connections once a connection exists
+    if server_name not in _no_string_agg:
         try:
-            conn_str = (
-                "DRIVER={ODBC Driver 18 for SQL Server};"
-                f"SERVER={server_host};UID={username};PWD={password};"
-                "TrustServerCertificate=yes;Encrypt=no;"
-            )
-            with pyodbc.connect(conn_str, timeout=5) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT name FROM sys.databases
-                    WHERE name NOT IN ('master','tempdb','model','msdb')
-                    ORDER BY name
-                """)
-                result[server_name] = [row[0] for row in cursor.fetchall()]
-        except Exception as e:
-            result[server_name] = []
-            logging.error(f"Cannot connect to {server_host}: {e}")
+            packed = conn.cursor().execute(_DB_STATES_AGG_SQL).fetchval()
+            if not packed:
+                return []
+            return [tuple(item.split("\x1f", 1)) for item in packed.split("\x1e")]
+        except pyodbc.ProgrammingError as e:
+            logging.debug(f"STRING_AGG unavailable on {server_name}, using row fetch: {e}")
+            _no_string_agg.add(server_name)
+    cursor = conn.cursor()
+    cursor.arraysize = 256
+    return [(row[0], row[1]) for row in cursor.execute(_DB_STATES_SQL).fetchall()]
+
+def _probe_server(srv, max_age=DB_LIST_TTL):
+    """
+    Connect to one SQL Server (a ServerConf) and return
+    (name, [(database, state_desc)], monotonic time the states were read).
+    """
+    server_name, server_host = srv.name, srv.server
+    cached = _db_list_cache.get(server_name)
+    if cached and time.monotonic() - cached[0] < max_age:
+        return server_name, cached[1], cached[0]
+
+    logging.debug(f"Trying to connect to SQL Server: {server_host}")
+    try:
+        with get_conn(server_name, srv.conn_str) as conn:
+            dbs = _fetch_database_states(conn, server_name)
+        fetched = time.monotonic()
+        _db_list_cache[server_name] = (fetched, dbs)
+        return server_name, dbs, fetched
+    except Exception as e:
+        logging.error(f"Cannot connect to {server_host}: {e}")
+        if cached:
+            # Better a slightly stale list than an empty one; retried next request.
+            # The server is down though, so none of its databases count as up.
+            logging.warning(f"Serving cached database list for {server_name}")
+            return server_name, [(name, "UNREACHABLE") for name, _ in cached[1]], time.monotonic()
+        return server_name, [], time.monotonic()
+
+# Shared across requests so each page load doesn't pay for spinning up threads
+# Threads are created on demand and each mostly sits in a blocking connect, so
+# dozens of servers are fine; raise DISCOVERY_MAX_WORKERS for larger fleets
+DISCOVERY_MAX_WORKERS = int(os.environ.get("DISCOVERY_MAX_WORKERS", 64))
+_discovery_pool = ThreadPoolExecutor(max_workers=DISCOVERY_MAX_WORKERS, thread_name_prefix="sql-discovery")
+
+# Whole-discovery result, so request bursts skip even the per-server cache walk
+_DISCOVERY_CACHE = {"ts": 0.0, "snapshot": None, "val": None}
+_discovery_lock = threading.Lock()
+
+def _probe_all_servers(max_age=DB_LIST_TTL) -> dict:
+    """Probe every configured server in parallel: {server: [(database, state_desc)]}."""
+    snapshot = get_config()
+    cached = _DISCOVERY_CACHE
+    if cached["snapshot"] is snapshot and time.monotonic() - cached["ts"] < max_age:
+        return cached["val"]
+    # One thread refreshes; concurrent callers wait and then reuse its result
+    with _discovery_lock:
+        if cached["snapshot"] is snapshot and time.monotonic() - cached["ts"] < max_age:
+            return cached["val"]
+        servers = snapshot.sqlservers
+        # Each probe is independent network I/O, so fan them out and wait on the slowest;
+        # map() yields in submission order, which keeps the YAML ordering for the templates
+        probed = list(_discovery_pool.map(lambda srv: _probe_server(srv, max_age), servers.values())) if servers else []
+        result = {name: dbs for name, dbs, _ in probed}
+        # As old as the oldest per-server entry reused, so a later STATUS_TTL caller
+        # never accepts DB_LIST_TTL-old states as fresh
+        ts = min((fetched for _, _, fetched in probed), default=time.monotonic())
+        cached.update(ts=ts, snapshot=snapshot, val=result)
     return result
 
+def invalidate_discovery_cache():
+    _DISCOVERY_CACHE["ts"] = 0.0
+    _db_list_cache.clear()
+
+def get_sql_servers_and_databases() -> dict:
+    return {server: [name for name, _ in dbs] for server, dbs in _probe_all_servers().items()}
+
+def get_sql_servers_and_db_status():
+    """Database lists and up/down status from the same sys.databases query."""
+    probed = _probe_all_servers(max_age=STATUS_TTL)
+    sqlservers = {server: [name for name, _ in dbs] for server, dbs in probed.items()}
+    db_status = {
+        name: "up" if state == "ONLINE" else "down"
+        for dbs in probed.values()
+        for name, state in dbs
+    }
+    return sqlservers, db_status
+
 # ---------------- Run Sync ----------------
-def run_sync(server, database):
+# Set RUN_SYNC_IN_SUBPROCESS=1 to isolate each sync in its own interpreter (old behaviour)
+RUN_SYNC_IN_SUBPROCESS = os.environ.get("RUN_SYNC_IN_SUBPROCESS", "0") == "1"
+# Manual sync output is written here and served by /logs/<log_id>
+LOG_DIR = os.path.join(BASE_DIR, "logs")
+LOG_TAIL_BYTES = 64 * 1024
+# Manual syncs run here so a slow sync doesn't pin a request thread indefinitely
+sync_executor = ThreadPoolExecutor(max_workers=int(os.environ.get("SYNC_WORKERS", 4)),
+                                   thread_name_prefix="sync")
+SYNC_WAIT_TIMEOUT = float(os.environ.get("SYNC_WAIT_TIMEOUT", 300))
+
+# Libraries preloaded once in the forkserver; children fork from it instead of
+# booting a fresh interpreter. hybrid_sync itself is not preloaded because it
+# opens database connections at import time.
+SYNC_PRELOAD = ["yaml", "pyodbc", "pandas", "sqlalchemy", "psycopg2", "sync_worker"]
+_sync_ctx = None
+
+def _get_sync_context():
+    """forkserver context for sync children, or None where it is unavailable (Windows)."""
+    global _sync_ctx
+    if _sync_ctx is None and "forkserver" in mp.get_all_start_methods():
+        ctx = mp.get_context("forkserver")
+        ctx.set_forkserver_preload(SYNC_PRELOAD)
+        _sync_ctx = ctx
+    return _sync_ctx
+
+def _run_sync_subprocess(server, database, log_path=None):
+    ctx = _get_sync_context()
+    if ctx is not None:
+        from sync_worker import run_sync_child
+        proc = ctx.Process(target=run_sync_child, args=(server, database, log_path),
+                           name=f"sync-{server}-{database}")
+        proc.start()
+        proc.join()
+        if proc.exitcode:
+            raise RuntimeError(f"sync process exited with code {proc.exitcode}")
+        return
+
+    env = os.environ.copy()
+    env["DB_NAME"] = database
+    env["SELECTED_SERVER"] = server
+    # Stream child output to disk (or drop it) instead of buffering it in memory
+    if log_path:
+        with open(log_path, "ab", buffering=0) as out:
+            subprocess.run([sys.executable, HYBRID_SYNC_PATH], stdout=out, stderr=subprocess.STDOUT, env=env)
+    else:
+        subprocess.run([sys.executable, HYBRID_SYNC_PATH], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env)
+
+def _run_sync_in_process(server, database, log_path=None):
+    # Imported lazily: hybrid_sync pulls in pandas/SQLAlchemy, paid once per process
+    from hybrid_sync import main as sync_main
+    handler = None
+    if log_path:
+        # Other threads' records may interleave; good enough for a run log
+        handler = logging.FileHandler(log_path)
+        handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+        logging.getLogger().addHandler(handler)
+    try:
+        sync_main(server=server, database=database)
+    finally:
+        if handler:
+            logging.getLogger().removeHandler(handler)
+            handler.close()
+
+def run_sync(server, database, log_path=None):
     try:
         logging.info(f"[SYNC] Running sync for {server}/{database}")
-        script_path = os.path.join(os.path.dirname(__file__), "hybrid_sync.py")
-        env = os.environ.copy()
-        env["DB_NAME"] = database
-        env["SELECTED_SERVER"] = server
-        subprocess.run([sys.executable, script_path], capture_output=True, text=True, env=env)
+        if RUN_SYNC_IN_SUBPROCESS:
+            _run_sync_subprocess(server, database, log_path)
+        else:
+            try:
+                _run_sync_in_process(server, database, log_path)
+            except ImportError as e:
+                logging.warning(f"[SYNC] Cannot import hybrid_sync ({e}), falling back to subprocess")
+                _run_sync_subprocess(server, database, log_path)
         logging.info(f"[SYNC] Finished {server}/{database}")
     except Exception as e:
         logging.error(f"[SYNC] Error running sync for {server}/{database}: {e}")
 
 # ---------------- Manual Scheduler ----------------
 def schedule_job(job_id, server, database, interval=None, run_time=None):
-    def job_loop():
-        logging.info(f"[JOB {job_id}] Started for {server}/{database}")
-        while not stop_flags.get(job_id, False):
-            if interval:
-                run_sync(server, database)
-                time.sleep(interval)
-            elif run_time:
-                now = time.localtime()
-                target_seconds = run_time[0]*3600 + run_time[1]*60
-                current_seconds = now.tm_hour*3600 + now.tm_min*60 + now.tm_sec
-                sleep_time = (target_seconds - current_seconds) % (24*3600)
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
-                if not stop_flags.get(job_id, False):
-                    run_sync(server, database)
-        logging.info(f"[JOB {job_id}] Stopped")
-    threading.Thread(target=job_loop, daemon=True).start()
+    job_opts = {"id": job_id, "args": [server, database]}
+    if interval:
+        # Interval schedules used to sync straight away, then every `interval` seconds
+        trigger = IntervalTrigger(seconds=interval)
+        scheduler.add_job(run_sync, trigger, next_run_time=datetime.now(), **job_opts)
+    else:
+        # Fires on the wall-clock time; no local sleep arithmetic to drift
+        trigger = CronTrigger(hour=run_time[0], minute=run_time[1])
+        scheduler.add_job(run_sync, trigger, **job_opts)
+    logging.info(f"[JOB {job_id}] Scheduled for {server}/{database}, "
+                 f"next run {scheduler.get_job(job_id).next_run_time}")
 
 # ---------------- Register Blueprint ----------------
 app.register_blueprint(manage_server_bp)
@@ -133,67 +390,58 @@ app.register_blueprint(manage_server_bp)
 
 @app.route("/")
 @login_required(roles=["admin","operator","viewer"])
+@cache.cached(timeout=STATUS_TTL, key_prefix=page_cache_key)
 def index():
-    sqlservers = get_sql_servers_and_databases()
-    pg_conf = config.get("postgresql", {})
-
-    db_status = {}
-    for server_name, db_list in sqlservers.items():
-        status_dict = check_all_databases({"server": server_name, **config["sqlservers"].get(server_name, {})})
-        for db_name, status_info in status_dict.items():
-            db_status[db_name] = status_info.get("status", "down")
-
+    sqlservers, db_status = get_sql_servers_and_db_status()
+    pg_conf = get_config().postgresql
     return render_template("index.html", sqlservers=sqlservers, db_status=db_status, pg_conf=pg_conf)
 
+# ----------- Conditional GET on the YAML snapshot -----------
+def config_conditional(include_role=False):
+    """Answer 304 when the client already has the response for the current YAML."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            snapshot = get_config()
+            mtime, size = snapshot.mtime, snapshot.size
+            etag = f"{int(mtime * 1000)}-{size}"
+            if include_role:
+                # Rendered pages differ per role (navbar, admin controls)
+                etag += f"-{session.get('role')}"
+            # Checked before the view so cached/rendered bodies are skipped entirely
+            if request.if_none_match.contains(etag):
+                resp = Response(status=304)
+                resp.set_etag(etag)
+                return resp
+            resp = make_response(view(*args, **kwargs))
+            resp.set_etag(etag)
+            resp.last_modified = datetime.fromtimestamp(mtime)
+            return resp.make_conditional(request)
+        return wrapper
+    return decorator
+
+def config_page_cache_key():
+    """page_cache_key plus the YAML stamp, so a cached render always matches config_conditional's ETag"""
+    snapshot = get_config()
+    return f"{page_cache_key()}/{snapshot.mtime}-{snapshot.size}"
+
 # ----------- All Servers Page -----------
 @app.route("/all-servers")
 @login_required(roles=["admin","operator","viewer"])
+@config_conditional(include_role=True)
+@cache.cached(key_prefix=config_page_cache_key)
 def all_servers():
-    config = load_config()
-    sqlservers = config.get("sqlservers", {})
+    sqlservers = {name: srv.raw for name, srv in get_config().sqlservers.items()}
     return render_template("all_servers.html", sqlservers=sqlservers)
 
-# ----------- API to list servers -----------
-# ----------- API to list servers -----------
-# ----------- API to list servers -----------
-@app.route("/api/sqlservers/list")
-@login_required(roles=["admin", "operator", "viewer"])
-def list_sqlservers():
-    config = load_config()
-    servers = config.get("sqlservers", {})
-    return jsonify(servers)
-
-
-def get_sql_servers_and_databases() -> dict:
-    config = load_config()
-    servers = config.get("sqlservers", {})
-    result = {}
-    for server_name, conf in servers.items():
-        server_host = conf.get("server", "localhost")
-        username = conf.get("username", "sa")
-        password = conf.get("password", "root")
-        logging.debug(f"Trying to connect to SQL Server: {server_host}")
-        try:
-            conn_str = (
-                "DRIVER={ODBC Driver 18 for SQL Server};"
-                f"SERVER={server_host};UID={username};PWD={password};"
-                "TrustServerCertificate=yes;Encrypt=no;"
-            )
-            with pyodbc.connect(conn_str, timeout=5) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT name 
-                    FROM sys.databases 
-                    WHERE name NOT IN ('master', 'tempdb', 'model', 'msdb')
-                    ORDER BY name
-                """)
-                dbs = [row[0] for row in cursor.fetchall()]
-                result[server_name] = dbs
-        except Exception as e:
-            result[server_name] = []
-            logging.error(f"Cannot connect to {server_host}: {e}")
-    return result
-
+# ----------- API to drop cached discovery results -----------
+@app.route("/api/discovery/invalidate", methods=["POST"])
+@login_required(roles=["admin"])
+def discovery_invalidate():
+    invalidate_discovery_cache()
+    cache.clear()
+    logging.info("Discovery cache invalidated")
+    return jsonify({"status": "ok"})
 
 # ----------- API to list databases for a server -----------
 @app.route("/api/sqlservers/<server_name>/databases", methods=["GET"])
@@ -214,23 +462,77 @@ def list_sqlserver_databases(server_name):
         "count": len(all_servers[server_name])
     })
 
+# ---------------- Lazy Imports ----------------
+@functools.lru_cache(maxsize=None)
+def _get_comprehensive_logger():
+    """Import comprehensive_logging on first use; it pulls in SQLAlchemy and connects to Postgres."""
+    from comprehensive_logging import comprehensive_logger
+    return comprehensive_logger
+
+# ---------------- Background Jobs ----------------
+# Slow lookups run here and are polled via /api/jobs/<id>, so a hung server
+# can't tie up request threads. Results are kept for JOB_RESULT_TTL seconds.
+job_executor = ThreadPoolExecutor(max_workers=int(os.environ.get("EXECUTOR_MAX_WORKERS", 8)),
+                                  thread_name_prefix="job")
+JOB_RESULT_TTL = 600
+_jobs = {}               # job_id -> (monotonic submit time, Future)
+
+def submit_job(fn, *args):
+    now = time.monotonic()
+    for job_id, (submitted, future) in list(_jobs.items()):
+        if future.done() and now - submitted > JOB_RESULT_TTL:
+            _jobs.pop(job_id, None)
+    job_id = uuid.uuid4().hex
+    _jobs[job_id] = (now, job_executor.submit(fn, *args))
+    return job_id
+
+@app.route("/api/sqlservers/discover", methods=["POST"])
+@login_required(roles=["admin","operator","viewer"])
+def discover_sqlservers_async():
+    job_id = submit_job(get_sql_servers_and_databases)
+    return jsonify({"status": "accepted", "job_id": job_id, "poll_url": f"/api/jobs/{job_id}"}), 202
+
+@app.route("/api/dashboard/data", methods=["POST"])
+@login_required(roles=["admin","operator","viewer"])
+def dashboard_data_async():
+    job_id = submit_job(_get_comprehensive_logger().get_dashboard_data)
+    return jsonify({"status": "accepted", "job_id": job_id, "poll_url": f"/api/jobs/{job_id}"}), 202
+
+@app.route("/api/jobs/<job_id>")
+@login_required(roles=["admin","operator","viewer"])
+def job_status(job_id):
+    entry = _jobs.get(job_id)
+    if entry is None:
+        return jsonify({"status": "error", "error": "Unknown job"}), 404
+    future = entry[1]
+    if not future.done():
+        return jsonify({"status": "running"}), 202
+    try:
+        return jsonify({"status": "done", "result": future.result()})
+    except Exception as e:
+        return jsonify({"status": "error", "error": str(e)}), 500
+
 # ---------------- Other Routes ----------------
 @app.route("/dashboard")
 @login_required(roles=["admin","operator","viewer"])
+@cache.cached(timeout=10, key_prefix=page_cache_key)
 def dashboard():
-    data = comprehensive_logger.get_dashboard_data()
+    data = _get_comprehensive_logger().get_dashboard_data()
     return render_template("dashboard.html", data=data)
 
 @app.route("/migration-control")
 @login_required(roles=["admin","operator","viewer"])
+@cache.cached(key_prefix=page_cache_key)
 def migration_control():
     sqlservers = get_sql_servers_and_databases()
+    url = _get_comprehensive_logger().engine.url
     pg_conf = {
-        "host": comprehensive_logger.engine.url.host,
-        "port": comprehensive_logger.engine.url.port,
-        "database": comprehensive_logger.engine.url.database,
-        "username": comprehensive_logger.engine.url.username
+        "host": url.host,
+        "port": url.port,
+        "database": url.database,
+        "username": url.username
     }
+    from view_details_database import list_all_databases
     dbs = list_all_databases()
     return render_template("migration_control.html", sqlservers=sqlservers, pg_conf=pg_conf, databases=dbs)
 
@@ -238,58 +540,141 @@ def migration_control():
 @login_required(roles=["admin","operator"])
 def run_sync_manual(server_name, db_name):
     try:
-        run_sync(server_name, db_name)
-        return jsonify({"status": "success"})
+        os.makedirs(LOG_DIR, exist_ok=True)
+        log_id = uuid.uuid4().hex
+        future = sync_executor.submit(run_sync, server_name, db_name,
+                                      log_path=os.path.join(LOG_DIR, f"{log_id}.log"))
+        try:
+            future.result(timeout=SYNC_WAIT_TIMEOUT)
+        except FutureTimeout:
+            # Still running in the background; the log keeps growing at log_url
+            return jsonify({"status": "running", "log_url": f"/logs/{log_id}"}), 202
+        return jsonify({"status": "success", "log_url": f"/logs/{log_id}"})
     except Exception as e:
         logging.error(f"Error running sync for {server_name}/{db_name}: {e}")
         return jsonify({"status": "error", "error": str(e)}), 500
 
+@app.route("/logs/<log_id>")
+@login_required(roles=["admin","operator"])
+def sync_log(log_id):
+    """Return the tail of a manual sync's log as plain text."""
+    log_path = os.path.join(LOG_DIR, f"{secure_filename(log_id)}.log")
+    if not os.path.isfile(log_path):
+        return jsonify({"status": "error", "error": "Log not found"}), 404
+    with open(log_path, "rb") as f:
+        f.seek(max(0, os.path.getsize(log_path) - LOG_TAIL_BYTES))
+        tail = f.read()
+    return Response(tail, mimetype="text/plain")
+
 @app.route("/database/<db_name>")
 @login_required(roles=["admin","operator","viewer"])
+@cache.cached(timeout=10, key_prefix=page_cache_key)
 def database_details(db_name):
+    from view_details_database import get_database_details
     tables, object_count = get_database_details(db_name)
     return render_template("tables.html", db_name=db_name, tables=tables, object_count=object_count)
 
 # ---------------- Schedule Routes ----------------
 @app.route("/schedule")
 @login_required(roles=["admin","operator"])
+@cache.cached(key_prefix=page_cache_key)
 def schedule_page():
     sqlservers = get_sql_servers_and_databases()
-    return render_template("schedule.html", sqlservers=sqlservers, schedules=list(schedules.values()))
+    jobs = []
+    for info in schedules.values():
+        job = scheduler.get_job(info["id"])
+        next_run = job.next_run_time.strftime("%Y-%m-%d %H:%M") if job and job.next_run_time else "-"
+        jobs.append({**info, "next_run": next_run})
+    return render_template("schedule.html", sqlservers=sqlservers, schedules=jobs)
 
 @app.route("/api/schedule/add", methods=["POST"])
 @login_required(roles=["admin","operator"])
 def add_schedule():
+    global schedules
     server = request.form["server"]
     database = request.form["database"]
     sched_type = request.form["type"]
     job_id = str(uuid.uuid4())
 
     with lock:
-        stop_flags[job_id] = False
+        updated = dict(schedules)
         if sched_type == "interval":
             minutes = int(request.form.get("minutes", 60))
-            schedules[job_id] = {"id": job_id, "server": server, "database": database, "type": "interval", "details": f"Every {minutes} minutes"}
+            updated[job_id] = {"id": job_id, "server": server, "database": database, "type": "interval", "details": f"Every {minutes} minutes"}
             schedule_job(job_id, server, database, interval=minutes*60)
         else:
             time_str = request.form.get("time", "02:00")
             hour, minute = map(int, time_str.split(":"))
-            schedules[job_id] = {"id": job_id, "server": server, "database": database, "type": "daily", "details": f"Daily at {time_str}"}
+            updated[job_id] = {"id": job_id, "server": server, "database": database, "type": "daily", "details": f"Daily at {time_str}"}
             schedule_job(job_id, server, database, run_time=(hour, minute))
+        schedules = updated
 
+    cache.clear()
     return jsonify({"status": "ok", "job_id": job_id})
 
 @app.route("/api/schedule/delete/<job_id>", methods=["DELETE"])
 @login_required(roles=["admin","operator"])
 def delete_schedule(job_id):
+    global schedules
+    # Unlocked fast path for unknown ids
+    if job_id not in schedules:
+        return jsonify({"status": "not found"}), 404
     with lock:
         if job_id in schedules:
-            stop_flags[job_id] = True
-            del schedules[job_id]
+            scheduler.remove_job(job_id)
+            schedules = {k: v for k, v in schedules.items() if k != job_id}
+            logging.info(f"[JOB {job_id}] Stopped")
+            cache.clear()
             return jsonify({"status": "deleted"})
     return jsonify({"status": "not found"}), 404
 
+# ---------------- Init ----------------
+# Debug mode (and the Werkzeug reloader) only when asked for explicitly
+DEBUG = os.environ.get("FLASK_DEBUG") == "1"
+
+def init_app():
+    """One-time per-process setup; runs once per WSGI worker at import."""
+    # Ensure 'sqlservers' section exists
+    config = load_config()
+    if "sqlservers" not in config:
+        config["sqlservers"] = {}
+        save_config(config)
+    # With the reloader on, the parent process only watches files; the child does the work
+    if DEBUG and os.environ.get("WERKZEUG_RUN_MAIN") != "true":
+        return
+    if not scheduler.running:
+        scheduler.start()
+    if os.environ.get("WARM_CONNECTIONS", "1") == "1":
+        threading.Thread(target=warm_connections, name="conn-warmup", daemon=True).start()
+
+def shutdown_app():
+    """Stop background work so the process exits promptly instead of waiting on jobs."""
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+    sync_executor.shutdown(wait=False, cancel_futures=True)
+    _discovery_pool.shutdown(wait=False, cancel_futures=True)
+    job_executor.shutdown(wait=False, cancel_futures=True)
+    close_sql_pools()
+
+# Sync children started from the forkserver re-import this script as __mp_main__;
+# they must not start a second scheduler, warm-up thread or shutdown hook
+if mp.parent_process() is None:
+    init_app()
+    atexit.register(shutdown_app)
+
 # ---------------- Main ----------------
 if __name__ == "__main__":
-    logging.info("Starting Flask app...")
-    app.run(debug=True)
+    if DEBUG:
+        logging.info("Starting Flask dev server (FLASK_DEBUG=1)...")
+        app.run(debug=True, use_reloader=True)
+    else:
+        try:
+            from waitress import serve
+        except ImportError:
+            logging.warning("waitress not installed, falling back to the Flask dev server")
+            app.run(debug=False, use_reloader=False)
+        else:
+            host = os.environ.get("HOST", "0.0.0.0")
+            port = int(os.environ.get("PORT", 5000))
+            logging.info(f"Starting Flask app with waitress on {host}:{port}...")
+            serve(app, host=host, port=port, threads=int(os.environ.get("WAITRESS_THREADS", 16)))
@@ -1,13 +1,75 @@
+import os
+import hashlib
+import logging
+import secrets
 import functools
+import threading
+from collections import OrderedDict
 from flask import Flask, session, redirect, url_for, request, render_template, flash
+from werkzeug.security import generate_password_hash, check_password_hash
 
 # ---------------- In-Memory Users ----------------
-# Predefined users for demonstration
-users = {
-    "admin": {"password": "admin123", "role": "admin"},
-    "operator1": {"password": "operator123", "role": "operator"},
-    "viewer1": {"password": "viewer123", "role": "viewer"}
-}
+class UserStore:
+    """Thread-safe user table; per process, so every WSGI worker has its own copy."""
+
+    def __init__(self, initial=None):
+        self._lock = threading.RLock()
+        self._users = dict(initial or {})
+
+    def get(self, username):
+        with self._lock:
+            return self._users.get(username)
+
+    def create(self, username, pw_hash, role):
+        """Add a user; False if the name is already taken (check and insert are atomic)."""
+        with self._lock:
+            if username in self._users:
+                return False
+            self._users[username] = {"pw_hash": pw_hash, "role": role}
+            return True
+
+    def snapshot(self):
+        """Copy of all users for display."""
+        with self._lock:
+            return dict(self._users)
+
+# Predefined users for demonstration; only password hashes are kept
+users = UserStore({
+    "admin": {"pw_hash": generate_password_hash("admin123"), "role": "admin"},
+    "operator1": {"pw_hash": generate_password_hash("operator123"), "role": "operator"},
+    "viewer1": {"pw_hash": generate_password_hash("viewer123"), "role": "viewer"}
+})
+
+# ---------------- Password Verification ----------------
+# The KDF is deliberately slow, so remember recent successful checks.
+# Keyed on the stored hash too: a changed password never matches an old entry.
+_VERIFY_CACHE_SIZE = 512
+_verified = OrderedDict()    # (username, sha256(password), pw_hash) -> True
+_verified_lock = threading.Lock()
+
+def verify_password(username, password):
+    user = users.get(username)
+    if not user:
+        return False
+    key = (username, hashlib.sha256(password.encode()).digest(), user["pw_hash"])
+    with _verified_lock:
+        if key in _verified:
+            _verified.move_to_end(key)
+            return True
+    # Failures are never cached, so guessing always pays the full KDF cost
+    if not check_password_hash(user["pw_hash"], password):
+        return False
+    with _verified_lock:
+        _verified[key] = True
+        if len(_verified) > _VERIFY_CACHE_SIZE:
+            _verified.popitem(last=False)
+    return True
+
+def clear_verify_cache():
+    with _verified_lock:
+        _verified.clear()
+
+VALID_ROLES = frozenset({"admin", "operator", "viewer"})
 
 # ---------------- Role-Based Access Decorator ----------------
 def login_required(roles=None):
@@ -15,13 +77,16 @@ def login_required(roles=None):
     Decorator to enforce login and role-based access.
     roles: list of roles allowed to access this route
     """
+    # Built once per decorated route, not per request
+    allowed_roles = frozenset(roles) if roles else None
+
     def decorator(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             if "username" not in session:
                 flash("Please login first", "warning")
                 return redirect(url_for("login"))
-            if roles and session.get("role") not in roles:
+            if allowed_roles is not None and session.get("role") not in allowed_roles:
                 flash("Access denied: insufficient permissions", "danger")
                 return redirect(url_for("index"))
             return func(*args, **kwargs)
@@ -31,7 +96,24 @@ def login_required(roles=None):
 # ---------------- Initialize Authentication ----------------
 def init_auth(app: Flask):
     # Secret key for sessions
-    app.secret_key = "supersecretkey"  # Change this in production
+    secret_key = os.environ.get("SECRET_KEY")
+    if not secret_key:
+        # Sessions then only survive as long as this process (and one worker)
+        logging.warning("SECRET_KEY not set, using a random per-process key")
+        secret_key = secrets.token_bytes(32)
+    app.secret_key = secret_key
+
+    # Server-side sessions: the cookie carries only an id, the data lives in Redis
+    redis_url = os.environ.get("SESSION_REDIS_URL")
+    if redis_url:
+        try:
+            import redis
+            from flask_session import Session
+        except ImportError:
+            logging.warning("SESSION_REDIS_URL set but flask-session/redis not installed; using cookie sessions")
+        else:
+            app.config.update(SESSION_TYPE="redis", SESSION_REDIS=redis.Redis.from_url(redis_url))
+            Session(app)
 
     # -------- Login Route --------
     @app.route("/login", methods=["GET", "POST"])
@@ -39,10 +121,9 @@ def init_auth(app: Flask):
         if request.method == "POST":
             username = request.form.get("username").strip()
             password = request.form.get("password").strip()
-            user = users.get(username)
-            if user and user["password"] == password:
+            if verify_password(username, password):
                 session["username"] = username
-                session["role"] = user["role"]
+                session["role"] = users.get(username)["role"]
                 flash(f"Welcome, {username}!", "success")
                 return redirect(url_for("index"))
             flash("Invalid username or password", "danger")
@@ -65,13 +146,13 @@ def init_auth(app: Flask):
             role = request.form.get("role").strip()
 
             # Validation
-            if not username or not password or role not in ["admin", "operator", "viewer"]:
+            if not username or not password or role not in VALID_ROLES:
                 flash("Invalid input", "danger")
-            elif username in users:
+            elif not users.create(username, generate_password_hash(password), role):
                 flash("User already exists", "danger")
             else:
-                users[username] = {"password": password, "role": role}
+                clear_verify_cache()
                 flash(f"User '{username}' ({role}) created successfully", "success")
 
         # Pass all users to the template to display
-        return render_template("create_user.html", users=users)
+        return render_template("create_user.html", users=users.snapshot())
@@ -1,20 +1,54 @@
 # backend/sql_discovery.py
+import os
+import time
 import pyodbc
+from concurrent.futures import ThreadPoolExecutor
 
-def get_sql_servers_and_databases() -> dict:
-    servers = ['localhost', 'MYSERVER2']  # Add all servers you want to check
-    result = {}
+from connections import build_conn_str, get_conn
+
+SERVERS = ['localhost', 'MYSERVER2']  # Add all servers you want to check
+# Login for the probes; unset falls back to build_conn_str's defaults
+DISCOVERY_LOGIN = {k: v for k, v in (("username", os.environ.get("DISCOVERY_USERNAME")),
+                                     ("password", os.environ.get("DISCOVERY_PASSWORD"))) if v}
+
+# Probes are pure network wait, so one shared pool fans them out across calls
+# Threads are created on demand and each mostly sits in a blocking connect, so
+# dozens of servers are fine; raise DISCOVERY_MAX_WORKERS for larger fleets
+DISCOVERY_MAX_WORKERS = int(os.environ.get("DISCOVERY_MAX_WORKERS", 64))
+_discovery_pool = ThreadPoolExecutor(max_workers=DISCOVERY_MAX_WORKERS, thread_name_prefix="sql-discovery")
 
-    for server in servers:
+# Per-server TTL cache of database lists; only successful probes are stored,
+# so a failing server is re-probed next call while healthy ones are skipped
+DB_LIST_TTL = float(os.environ.get("DB_LIST_TTL", 60))
+_db_cache = {}           # server -> (monotonic fetch time, [databases])
+
+def _fetch_dbs(server):
+    cached = _db_cache.get(server)
+    if cached and time.monotonic() - cached[0] < DB_LIST_TTL:
+        return cached[1]
+    conn_str = build_conn_str({"server": server, **DISCOVERY_LOGIN})
+    with get_conn(server, conn_str) as conn:
+        cursor = conn.cursor()
         try:
-            conn_str = f'DRIVER={{ODBC Driver 18 for SQL Server}};SERVER={server};UID=sa;PWD=root;'
-            with pyodbc.connect(conn_str, timeout=5) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT name FROM sys.databases WHERE database_id > 4")  # skip system DBs
-                dbs = [row[0] for row in cursor.fetchall()]
-                result[server] = dbs
-        except Exception as e:
-            result[server] = []
-            print(f"Cannot connect to {server}: {e}")
+            # One aggregated string instead of a Row per database (SQL Server 2017+)
+            packed = cursor.execute(
+                "SELECT STRING_AGG(CAST(name AS NVARCHAR(MAX)), NCHAR(30)) "
+                "FROM sys.databases WHERE database_id > 4"  # skip system DBs
+            ).fetchval()
+            dbs = packed.split("\x1e") if packed else []
+        except pyodbc.ProgrammingError:
+            cursor.execute("SELECT name FROM sys.databases WHERE database_id > 4")  # skip system DBs
+            dbs = [row[0] for row in cursor.fetchall()]
+    _db_cache[server] = (time.monotonic(), dbs)
+    return dbs
+
+def _probe_server(server):
+    try:
+        return server, _fetch_dbs(server)
+    except Exception as e:
+        print(f"Cannot connect to {server}: {e}")
+        return server, []
 
-    return result
+def get_sql_servers_and_databases() -> dict:
+    # Total latency is the slowest server rather than the sum of all of them
+    return dict(_discovery_pool.map(_probe_server, SERVERS))
@@ -0,0 +1,16 @@
+"""Shared Flask-Caching instance for rendered pages and slow lookups."""
+import os
+from flask import request, session
+from flask_caching import Cache
+
+# ---------------- Cache ----------------
+# SimpleCache is per-process; set CACHE_TYPE (e.g. RedisCache) to share across workers
+cache = Cache(config={
+    "CACHE_TYPE": os.environ.get("CACHE_TYPE", "SimpleCache"),
+    "CACHE_DEFAULT_TIMEOUT": int(os.environ.get("CACHE_TIMEOUT", 30)),
+    "CACHE_REDIS_URL": os.environ.get("CACHE_REDIS_URL"),
+})
+
+def page_cache_key():
+    """Cache key for a rendered page; templates show role-dependent controls."""
+    return f"view/{request.path}/{session.get('role')}"
@@ -1,5 +1,11 @@
+import io
 import os
-import yaml
+import csv
+import queue
+import atexit
+import functools
+import threading
+from config_cache import get_config
 import pandas as pd
 import logging
 from datetime import datetime, timedelta
@@ -7,25 +13,237 @@ from sqlalchemy import create_engine, text, MetaData, inspect
 from pathlib import Path
 import json
 from typing import Dict, List, Tuple, Optional
-import uuid
+import time
 import psutil
 import platform
 
 # Load configuration
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), '../config/db_connections.yaml')
-with open(CONFIG_PATH, 'r') as f:
-    config = yaml.safe_load(f)
+config = get_config(CONFIG_PATH)
 
 pg_conf = config['postgresql']
 
+# Rows are queued to a writer thread and written per table with one executemany per batch
+LOG_BUFFER_LIMIT = int(os.environ.get("LOG_BUFFER_LIMIT", "500"))
+LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", "10000"))
+LOG_FLUSH_INTERVAL = float(os.environ.get("LOG_FLUSH_INTERVAL", "0.5"))  # seconds a batch may wait to fill
+# Longest wait for the writer to catch up (run end, exit); dashboard reads wait less
+LOG_FLUSH_TIMEOUT = float(os.environ.get("LOG_FLUSH_TIMEOUT", "30"))
+DASHBOARD_FLUSH_TIMEOUT = float(os.environ.get("DASHBOARD_FLUSH_TIMEOUT", "2"))
+LOG_POOL_SIZE = int(os.environ.get("LOG_POOL_SIZE", "10"))
+LOG_POOL_OVERFLOW = int(os.environ.get("LOG_POOL_OVERFLOW", "20"))
+
+BUFFERED_INSERTS = {
+    'server_logs': text("""
+        INSERT INTO server_logs (run_id, server_name, database_name, log_level, log_message, additional_data)
+        VALUES (:run_id, :server_name, :database_name, :log_level, :message, :additional_data)
+    """),
+    'table_sync_logs': text("""
+        INSERT INTO table_sync_logs 
+        (run_id, server_name, database_name, schema_name, table_name, sync_type,
+         source_row_count, target_row_count, rows_processed, rows_inserted, sync_duration_seconds,
+         sync_status, error_message, data_consistency_percentage)
+        VALUES (:run_id, :server_name, :database_name, :schema_name, :table_name, :sync_type,
+                :source_count, :target_count, :rows_processed, :rows_inserted, :duration,
+                :status, :error_msg, :consistency_percentage)
+    """),
+    'row_count_audit': text("""
+        INSERT INTO row_count_audit 
+        (run_id, server_name, database_name, schema_name, table_name,
+         source_row_count, target_row_count, missing_rows, extra_rows,
+         consistency_percentage, audit_status)
+        VALUES (:run_id, :server_name, :database_name, :schema_name, :table_name,
+                :source_count, :target_count, :missing_rows, :extra_rows,
+                :consistency_percentage, :audit_status)
+    """),
+    'system_health_metrics': text("""
+        INSERT INTO system_health_metrics (run_id, metric_name, metric_value, metric_unit, server_info)
+        VALUES (:run_id, :metric_name, :value, :unit, :server_info)
+    """),
+    'performance_metrics': text("""
+        INSERT INTO performance_metrics (run_id, metric_category, metric_name, metric_value, metric_unit, context)
+        VALUES (:run_id, :category, :metric_name, :value, :unit, :context)
+    """),
+}
+
+# Statements are built once; SQLAlchemy's compiled cache then reuses their rendering
+START_RUN_SQL = text("""
+        INSERT INTO migration_runs (run_id, run_type, start_time, status)
+        VALUES (:run_id, :run_type, :start_time, 'RUNNING')
+        """)
+
+END_RUN_SQL = text("""
+        UPDATE migration_runs 
+        SET end_time = :end_time, status = :status,
+            total_servers = :total_servers,
+            total_databases = :total_databases,
+            total_tables = :total_tables,
+            total_rows_processed = :total_rows_processed,
+            total_rows_inserted = :total_rows_inserted,
+            successful_syncs = :successful_syncs,
+            failed_syncs = :failed_syncs,
+            error_message = :error_message
+        WHERE run_id = :run_id
+        """)
+
+ALERT_SQL = text("""
+        INSERT INTO alerts (run_id, alert_type, severity, server_name, database_name, 
+                           schema_name, table_name, alert_message)
+        VALUES (:run_id, :alert_type, :severity, :server_name, :database_name, 
+                :schema_name, :table_name, :message)
+        """)
+
+# get_dashboard_data in one round-trip: every section is aggregated to JSON server-side
+DASHBOARD_SQL = text("""
+        WITH latest AS (
+            SELECT run_id, run_type, start_time, end_time, status, total_servers, total_databases,
+                   total_tables, total_rows_processed, total_rows_inserted, successful_syncs, failed_syncs
+            FROM migration_runs 
+            ORDER BY start_time DESC 
+            LIMIT 1
+        ), recent AS (
+            SELECT run_id, run_type, start_time, end_time, status, total_rows_inserted, successful_syncs, failed_syncs
+            FROM migration_runs 
+            ORDER BY start_time DESC 
+            LIMIT 10
+        ), active_alerts AS (
+            SELECT alert_type, severity, server_name, database_name, table_name,
+                   alert_message AS message, alert_timestamp AS timestamp
+            FROM alerts 
+            WHERE is_resolved = FALSE 
+            ORDER BY alert_timestamp DESC 
+            LIMIT 20
+        ), consistency AS (
+            SELECT server_name, database_name, table_name, source_row_count AS source_count,
+                   target_row_count AS target_count, missing_rows,
+                   COALESCE(consistency_percentage, 0)::float AS consistency_percentage,
+                   audit_status AS status, audit_timestamp
+            FROM row_count_audit 
+            WHERE audit_status IN ('FAIL', 'WARNING')
+            ORDER BY audit_timestamp DESC 
+            LIMIT 20
+        ), health AS (
+            SELECT metric_name, COALESCE(metric_value, 0)::float AS value, metric_unit AS unit,
+                   metric_timestamp AS timestamp
+            FROM system_health_metrics 
+            WHERE run_id = (SELECT run_id FROM latest)
+            ORDER BY metric_timestamp DESC 
+            LIMIT 10
+        )
+        SELECT
+            (SELECT row_to_json(l) FROM latest l),
+            (SELECT COALESCE(json_agg(r ORDER BY r.start_time DESC), '[]') FROM recent r),
+            (SELECT COALESCE(json_agg(a ORDER BY a.timestamp DESC), '[]') FROM active_alerts a),
+            (SELECT COALESCE(json_agg(c ORDER BY c.audit_timestamp DESC), '[]') FROM consistency c),
+            (SELECT COALESCE(json_agg(h ORDER BY h.timestamp DESC), '[]') FROM health h)
+        """)
+
+# Append-only log tables, range-partitioned by month on their timestamp
+PARTITIONED_LOG_TABLES = ('table_sync_logs', 'row_count_audit', 'performance_metrics')
+# Months of partitions kept ready ahead of now, so rows never land in DEFAULT (a month
+# can't get its own partition once DEFAULT holds rows for it)
+LOG_PARTITION_MONTHS_AHEAD = int(os.environ.get("LOG_PARTITION_MONTHS_AHEAD", "6"))
+
+PARTITIONED_TABLES_SQL = text("""
+        SELECT c.relname
+        FROM pg_class c
+        WHERE c.relname = ANY(:names) AND c.relkind = 'p'
+          AND c.relnamespace = current_schema()::regnamespace
+        """)
+
+# Per-table audit/sync logs go through COPY: (table column, parameter key)
+COPY_COLUMNS = {
+    'table_sync_logs': [
+        ('run_id', 'run_id'), ('server_name', 'server_name'), ('database_name', 'database_name'),
+        ('schema_name', 'schema_name'), ('table_name', 'table_name'), ('sync_type', 'sync_type'),
+        ('source_row_count', 'source_count'), ('target_row_count', 'target_count'),
+        ('rows_processed', 'rows_processed'), ('rows_inserted', 'rows_inserted'),
+        ('sync_duration_seconds', 'duration'), ('sync_status', 'status'),
+        ('error_message', 'error_msg'), ('data_consistency_percentage', 'consistency_percentage'),
+    ],
+    'row_count_audit': [
+        ('run_id', 'run_id'), ('server_name', 'server_name'), ('database_name', 'database_name'),
+        ('schema_name', 'schema_name'), ('table_name', 'table_name'),
+        ('source_row_count', 'source_count'), ('target_row_count', 'target_count'),
+        ('missing_rows', 'missing_rows'), ('extra_rows', 'extra_rows'),
+        ('consistency_percentage', 'consistency_percentage'), ('audit_status', 'audit_status'),
+    ],
+}
+
+# ---------------- JSON Payloads ----------------
+# Columns queued as dicts and serialized by the writer thread
+JSON_COLUMNS = {
+    'server_logs': ('additional_data',),
+    'performance_metrics': ('context',),
+}
+
+# Runs log the same small context dicts over and over; serialize each distinct one once.
+# default=str: this runs on the writer thread, so datetimes etc. must not raise
+@functools.lru_cache(maxsize=256)
+def _dumps_items(items):
+    return json.dumps({k: v for k, _, v in items}, default=str)
+
+def _to_json(obj):
+    """JSON text for a JSONB column (None for empty payloads)"""
+    if not obj:
+        return None
+    try:
+        # The value's type is part of the key so 1, 1.0 and True stay distinct
+        return _dumps_items(tuple((k, type(v), v) for k, v in obj.items()))
+    except TypeError:  # nested lists/dicts are unhashable
+        return json.dumps(obj, default=str)
+
+# ---------------- Run Ids ----------------
+_last_run_us = 0
+_run_id_lock = threading.Lock()
+
+def _new_run_id():
+    """run_YYYYmmdd_HHMMSS_uuuuuu_xxxx: sorts by start time, so new keys land at the btree's right edge"""
+    global _last_run_us
+    with _run_id_lock:
+        # Strictly increasing within the process, even for two runs in the same microsecond
+        now_us = max(time.time_ns() // 1000, _last_run_us + 1)
+        _last_run_us = now_us
+    now = datetime.fromtimestamp(now_us / 1_000_000)
+    # The random tail only separates runs started by different processes at the same instant
+    return f"run_{now:%Y%m%d_%H%M%S}_{now.microsecond:06d}_{os.urandom(2).hex()}"
+
 class ComprehensiveLogger:
     """Comprehensive logging system for SQL Server to PostgreSQL migration"""
     
     def __init__(self):
         self.engine = create_engine(
-            f"postgresql+psycopg2://{pg_conf['username']}:{pg_conf['password']}@{pg_conf['host']}:{pg_conf['port']}/{pg_conf['database']}"
+            f"postgresql+psycopg2://{pg_conf['username']}:{pg_conf['password']}@{pg_conf['host']}:{pg_conf['port']}/{pg_conf['database']}",
+            pool_size=LOG_POOL_SIZE,
+            max_overflow=LOG_POOL_OVERFLOW,
+            pool_pre_ping=True,
+            pool_recycle=1800,
+            # Batched INSERTs go out as multi-row VALUES pages, other statements via execute_batch
+            executemany_mode="values_plus_batch",
+            insertmanyvalues_page_size=LOG_BUFFER_LIMIT,
+            executemany_batch_page_size=LOG_BUFFER_LIMIT
         )
+        # One long-lived connection for all writes; reads still use the pool
+        self._conn = None
+        self._conn_lock = threading.RLock()
+        # First of the month _ensure_partitions last ran for
+        self._partitions_month = None
+        self._buffer_limit = LOG_BUFFER_LIMIT
+        # ETL threads only enqueue; the writer thread does the round-trips
+        self._q = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        threading.Thread(target=self._writer, name="log-writer", daemon=True).start()
+        # Host facts never change; platform.processor() even spawns a subprocess
+        self._server_info_json = json.dumps({
+            'platform': platform.platform(),
+            'python_version': platform.python_version(),
+            'processor': platform.processor(),
+            'hostname': platform.node()
+        })
+        # Prime the counter so later non-blocking reads measure since this point
+        psutil.cpu_percent(interval=None)
         self.setup_logging_tables()
+        # Whatever is still buffered when the process ends
+        atexit.register(self.close)
         
     def setup_logging_tables(self):
         """Create comprehensive logging tables"""
@@ -63,7 +281,7 @@ class ComprehensiveLogger:
             """,
             'table_sync_logs': """
                 CREATE TABLE IF NOT EXISTS table_sync_logs (
-                    sync_id SERIAL PRIMARY KEY,
+                    sync_id SERIAL,
                     run_id VARCHAR(50),
                     server_name VARCHAR(100),
                     database_name VARCHAR(100),
@@ -82,12 +300,13 @@ class ComprehensiveLogger:
                     sync_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     data_consistency_status VARCHAR(20),
                     data_consistency_percentage DECIMAL(5,2),
+                    PRIMARY KEY (sync_id, sync_timestamp),
                     FOREIGN KEY (run_id) REFERENCES migration_runs(run_id)
-                )
+                ) PARTITION BY RANGE (sync_timestamp)
             """,
             'row_count_audit': """
                 CREATE TABLE IF NOT EXISTS row_count_audit (
-                    audit_id SERIAL PRIMARY KEY,
+                    audit_id SERIAL,
                     run_id VARCHAR(50),
                     server_name VARCHAR(100),
                     database_name VARCHAR(100),
@@ -100,8 +319,9 @@ class ComprehensiveLogger:
                     consistency_percentage DECIMAL(5,2),
                     audit_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     audit_status VARCHAR(20), -- 'PASS', 'FAIL', 'WARNING'
+                    PRIMARY KEY (audit_id, audit_timestamp),
                     FOREIGN KEY (run_id) REFERENCES migration_runs(run_id)
-                )
+                ) PARTITION BY RANGE (audit_timestamp)
             """,
             'system_health_metrics': """
                 CREATE TABLE IF NOT EXISTS system_health_metrics (
@@ -152,7 +372,7 @@ class ComprehensiveLogger:
             """,
             'performance_metrics': """
                 CREATE TABLE IF NOT EXISTS performance_metrics (
-                    metric_id SERIAL PRIMARY KEY,
+                    metric_id SERIAL,
                     run_id VARCHAR(50),
                     metric_category VARCHAR(50), -- 'SYNC_SPEED', 'DATA_TRANSFER', 'SYSTEM_RESOURCES'
                     metric_name VARCHAR(100),
@@ -160,123 +380,137 @@ class ComprehensiveLogger:
                     metric_unit VARCHAR(20),
                     metric_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     context JSONB,
+                    PRIMARY KEY (metric_id, metric_timestamp),
                     FOREIGN KEY (run_id) REFERENCES migration_runs(run_id)
-                )
+                ) PARTITION BY RANGE (metric_timestamp)
             """
         }
         
-        with self.engine.connect() as conn:
-            for table_name, create_sql in tables.items():
-                conn.execute(text(create_sql))
-                conn.commit()
-                logging.info(f"Logging table {table_name} created/verified")
+        # Access paths of get_dashboard_data
+        indexes = {
+            'ix_mig_runs_start': "CREATE INDEX IF NOT EXISTS ix_mig_runs_start ON migration_runs (start_time DESC)",
+            'ix_alerts_unresolved': "CREATE INDEX IF NOT EXISTS ix_alerts_unresolved ON alerts (alert_timestamp DESC) WHERE is_resolved = FALSE",
+            'ix_audit_failed': "CREATE INDEX IF NOT EXISTS ix_audit_failed ON row_count_audit (audit_timestamp DESC) WHERE audit_status IN ('FAIL', 'WARNING')",
+            'ix_health_run': "CREATE INDEX IF NOT EXISTS ix_health_run ON system_health_metrics (run_id, metric_timestamp DESC)",
+        }
+        
+        # Every CREATE in one round-trip and one transaction
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(";\n".join(tables.values()))
+            self._ensure_partitions(conn)
+            for index_name, create_sql in indexes.items():
+                # An index whose table predates these columns (e.g. the monitor's alerts) is skipped
+                try:
+                    with conn.begin_nested():
+                        conn.exec_driver_sql(create_sql)
+                except Exception as e:
+                    logging.warning(f"Index {index_name} not created: {e}")
+        logging.info(f"Verified {len(tables)} logging tables")
+    
+    def _ensure_partitions(self, conn):
+        """Monthly partitions (this month and LOG_PARTITION_MONTHS_AHEAD more) plus a DEFAULT catch-all for the log tables"""
+        this_month = first = datetime.now().date().replace(day=1)
+        # Tables created before partitioning stay plain tables; only partitioned ones get partitions
+        partitioned = {row[0] for row in conn.execute(PARTITIONED_TABLES_SQL,
+                                                      {'names': list(PARTITIONED_LOG_TABLES)})}
+        if not partitioned:
+            self._partitions_month = this_month
+            return
+        
+        months = []
+        for _ in range(LOG_PARTITION_MONTHS_AHEAD + 1):
+            following = (first + timedelta(days=32)).replace(day=1)
+            months.append((first, following))
+            first = following
+        
+        for table in partitioned:
+            statements = [f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"]
+            statements += [
+                f"CREATE TABLE IF NOT EXISTS {table}_{start:%Y%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{start}') TO ('{end}')"
+                for start, end in months
+            ]
+            for create_sql in statements:
+                # e.g. rows for that month already sitting in the DEFAULT partition
+                try:
+                    with conn.begin_nested():
+                        conn.exec_driver_sql(create_sql)
+                except Exception as e:
+                    logging.warning(f"Partition not created ({create_sql}): {e}")
+        self._partitions_month = this_month
     
     def start_migration_run(self, run_type: str = 'MANUAL') -> str:
         """Start a new migration run and return run_id"""
-        run_id = f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        run_id = _new_run_id()
         
-        query = """
-        INSERT INTO migration_runs (run_id, run_type, start_time, status)
-        VALUES (:run_id, :run_type, :start_time, 'RUNNING')
-        """
+        # The web process lives for months: roll the partitions forward once a month
+        if self._partitions_month != datetime.now().date().replace(day=1):
+            try:
+                self._write(self._ensure_partitions)
+            except Exception as e:
+                logging.warning(f"Could not create log partitions: {e}")
         
-        with self.engine.connect() as conn:
-            conn.execute(text(query), {
-                'run_id': run_id,
-                'run_type': run_type,
-                'start_time': datetime.now()
-            })
-            conn.commit()
+        self._execute(START_RUN_SQL, {
+            'run_id': run_id,
+            'run_type': run_type,
+            'start_time': datetime.now()
+        })
         
         logging.info(f"Started migration run: {run_id}")
         return run_id
     
     def end_migration_run(self, run_id: str, status: str, summary: Dict):
         """End a migration run with summary data"""
-        query = """
-        UPDATE migration_runs 
-        SET end_time = :end_time, status = :status,
-            total_servers = :total_servers,
-            total_databases = :total_databases,
-            total_tables = :total_tables,
-            total_rows_processed = :total_rows_processed,
-            total_rows_inserted = :total_rows_inserted,
-            successful_syncs = :successful_syncs,
-            failed_syncs = :failed_syncs,
-            error_message = :error_message
-        WHERE run_id = :run_id
-        """
-        
-        with self.engine.connect() as conn:
-            conn.execute(text(query), {
-                'run_id': run_id,
-                'end_time': datetime.now(),
-                'status': status,
-                'total_servers': summary.get('total_servers', 0),
-                'total_databases': summary.get('total_databases', 0),
-                'total_tables': summary.get('total_tables', 0),
-                'total_rows_processed': summary.get('total_rows_processed', 0),
-                'total_rows_inserted': summary.get('total_rows_inserted', 0),
-                'successful_syncs': summary.get('successful_syncs', 0),
-                'failed_syncs': summary.get('failed_syncs', 0),
-                'error_message': summary.get('error_message', None)
-            })
-            conn.commit()
+        self._flush_all()
+        self._execute(END_RUN_SQL, {
+            'run_id': run_id,
+            'end_time': datetime.now(),
+            'status': status,
+            'total_servers': summary.get('total_servers', 0),
+            'total_databases': summary.get('total_databases', 0),
+            'total_tables': summary.get('total_tables', 0),
+            'total_rows_processed': summary.get('total_rows_processed', 0),
+            'total_rows_inserted': summary.get('total_rows_inserted', 0),
+            'successful_syncs': summary.get('successful_syncs', 0),
+            'failed_syncs': summary.get('failed_syncs', 0),
+            'error_message': summary.get('error_message', None)
+        })
         
         logging.info(f"Ended migration run: {run_id} with status: {status}")
     
     def log_server_event(self, run_id: str, server_name: str, database_name: str, 
                         log_level: str, message: str, additional_data: Dict = None):
         """Log server-level events"""
-        query = """
-        INSERT INTO server_logs (run_id, server_name, database_name, log_level, log_message, additional_data)
-        VALUES (:run_id, :server_name, :database_name, :log_level, :message, :additional_data)
-        """
-        
-        with self.engine.connect() as conn:
-            conn.execute(text(query), {
-                'run_id': run_id,
-                'server_name': server_name,
-                'database_name': database_name,
-                'log_level': log_level,
-                'message': message,
-                'additional_data': json.dumps(additional_data) if additional_data else None
-            })
-            conn.commit()
+        self._buffer('server_logs', {
+            'run_id': run_id,
+            'server_name': server_name,
+            'database_name': database_name,
+            'log_level': log_level,
+            'message': message,
+            'additional_data': additional_data
+        })
     
     def log_table_sync(self, run_id: str, server_name: str, database_name: str, schema_name: str,
                       table_name: str, sync_type: str, source_count: int, target_count: int,
                       rows_processed: int, rows_inserted: int, duration: float, status: str,
                       error_msg: str = None, consistency_percentage: float = None):
         """Log table sync details"""
-        query = """
-        INSERT INTO table_sync_logs 
-        (run_id, server_name, database_name, schema_name, table_name, sync_type,
-         source_row_count, target_row_count, rows_processed, rows_inserted, sync_duration_seconds,
-         sync_status, error_message, data_consistency_percentage)
-        VALUES (:run_id, :server_name, :database_name, :schema_name, :table_name, :sync_type,
-                :source_count, :target_count, :rows_processed, :rows_inserted, :duration,
-                :status, :error_msg, :consistency_percentage)
-        """
-        
-        with self.engine.connect() as conn:
-            conn.execute(text(query), {
-                'run_id': run_id,
-                'server_name': server_name,
-                'database_name': database_name,
-                'schema_name': schema_name,
-                'table_name': table_name,
-                'sync_type': sync_type,
-                'source_count': source_count,
-                'target_count': target_count,
-                'rows_processed': rows_processed,
-                'rows_inserted': rows_inserted,
-                'duration': duration,
-                'status': status,
-                'error_msg': error_msg,
-                'consistency_percentage': consistency_percentage
-            })
-            conn.commit()
+        self._buffer('table_sync_logs', {
+            'run_id': run_id,
+            'server_name': server_name,
+            'database_name': database_name,
+            'schema_name': schema_name,
+            'table_name': table_name,
+            'sync_type': sync_type,
+            'source_count': source_count,
+            'target_count': target_count,
+            'rows_processed': rows_processed,
+            'rows_inserted': rows_inserted,
+            'duration': duration,
+            'status': status,
+            'error_msg': error_msg,
+            'consistency_percentage': consistency_percentage
+        })
     
     def log_row_count_audit(self, run_id: str, server_name: str, database_name: str, schema_name: str,
                            table_name: str, source_count: int, target_count: int):
@@ -287,36 +521,24 @@ class ComprehensiveLogger:
         
         audit_status = 'PASS' if source_count == target_count else 'FAIL' if consistency_percentage < 95 else 'WARNING'
         
-        query = """
-        INSERT INTO row_count_audit 
-        (run_id, server_name, database_name, schema_name, table_name,
-         source_row_count, target_row_count, missing_rows, extra_rows,
-         consistency_percentage, audit_status)
-        VALUES (:run_id, :server_name, :database_name, :schema_name, :table_name,
-                :source_count, :target_count, :missing_rows, :extra_rows,
-                :consistency_percentage, :audit_status)
-        """
-        
-        with self.engine.connect() as conn:
-            conn.execute(text(query), {
-                'run_id': run_id,
-                'server_name': server_name,
-                'database_name': database_name,
-                'schema_name': schema_name,
-                'table_name': table_name,
-                'source_count': source_count,
-                'target_count': target_count,
-                'missing_rows': missing_rows,
-                'extra_rows': extra_rows,
-                'consistency_percentage': consistency_percentage,
-                'audit_status': audit_status
-            })
-            conn.commit()
+        self._buffer('row_count_audit', {
+            'run_id': run_id,
+            'server_name': server_name,
+            'database_name': database_name,
+            'schema_name': schema_name,
+            'table_name': table_name,
+            'source_count': source_count,
+            'target_count': target_count,
+            'missing_rows': missing_rows,
+            'extra_rows': extra_rows,
+            'consistency_percentage': consistency_percentage,
+            'audit_status': audit_status
+        })
     
     def log_system_health(self, run_id: str):
         """Log system health metrics"""
-        # CPU Usage
-        cpu_percent = psutil.cpu_percent(interval=1)
+        # CPU Usage (since the previous call, without blocking)
+        cpu_percent = psutil.cpu_percent(interval=None)
         self._log_metric(run_id, 'system_health_metrics', 'CPU_USAGE', cpu_percent, 'PERCENT')
         
         # Memory Usage
@@ -330,208 +552,187 @@ class ComprehensiveLogger:
         self._log_metric(run_id, 'system_health_metrics', 'DISK_FREE', disk.free / (1024**3), 'GB')
         
         # System Info
-        server_info = {
-            'platform': platform.platform(),
-            'python_version': platform.python_version(),
-            'processor': platform.processor(),
-            'hostname': platform.node()
-        }
-        
-        query = """
-        INSERT INTO system_health_metrics (run_id, metric_name, metric_value, metric_unit, server_info)
-        VALUES (:run_id, 'SYSTEM_INFO', 0, 'INFO', :server_info)
-        """
-        
-        with self.engine.connect() as conn:
-            conn.execute(text(query), {
-                'run_id': run_id,
-                'server_info': json.dumps(server_info)
-            })
-            conn.commit()
+        self._buffer('system_health_metrics', {
+            'run_id': run_id,
+            'metric_name': 'SYSTEM_INFO',
+            'value': 0,
+            'unit': 'INFO',
+            'server_info': self._server_info_json
+        })
     
     def _log_metric(self, run_id: str, table: str, metric_name: str, value: float, unit: str):
         """Helper method to log metrics"""
-        query = f"""
-        INSERT INTO {table} (run_id, metric_name, metric_value, metric_unit)
-        VALUES (:run_id, :metric_name, :value, :unit)
-        """
-        
-        with self.engine.connect() as conn:
-            conn.execute(text(query), {
-                'run_id': run_id,
-                'metric_name': metric_name,
-                'value': value,
-                'unit': unit
-            })
-            conn.commit()
+        self._buffer(table, {
+            'run_id': run_id,
+            'metric_name': metric_name,
+            'value': value,
+            'unit': unit,
+            'server_info': None
+        })
     
     def log_alert(self, run_id: str, alert_type: str, severity: str, server_name: str,
                   database_name: str, schema_name: str, table_name: str, message: str):
         """Log alerts"""
-        query = """
-        INSERT INTO alerts (run_id, alert_type, severity, server_name, database_name, 
-                           schema_name, table_name, alert_message)
-        VALUES (:run_id, :alert_type, :severity, :server_name, :database_name, 
-                :schema_name, :table_name, :message)
-        """
-        
-        with self.engine.connect() as conn:
-            conn.execute(text(query), {
-                'run_id': run_id,
-                'alert_type': alert_type,
-                'severity': severity,
-                'server_name': server_name,
-                'database_name': database_name,
-                'schema_name': schema_name,
-                'table_name': table_name,
-                'message': message
-            })
-            conn.commit()
+        self._execute(ALERT_SQL, {
+            'run_id': run_id,
+            'alert_type': alert_type,
+            'severity': severity,
+            'server_name': server_name,
+            'database_name': database_name,
+            'schema_name': schema_name,
+            'table_name': table_name,
+            'message': message
+        })
     
     def log_performance_metric(self, run_id: str, category: str, metric_name: str, 
                               value: float, unit: str, context: Dict = None):
         """Log performance metrics"""
-        query = """
-        INSERT INTO performance_metrics (run_id, metric_category, metric_name, metric_value, metric_unit, context)
-        VALUES (:run_id, :category, :metric_name, :value, :unit, :context)
-        """
-        
-        with self.engine.connect() as conn:
-            conn.execute(text(query), {
-                'run_id': run_id,
-                'category': category,
-                'metric_name': metric_name,
-                'value': value,
-                'unit': unit,
-                'context': json.dumps(context) if context else None
-            })
-            conn.commit()
+        self._buffer('performance_metrics', {
+            'run_id': run_id,
+            'category': category,
+            'metric_name': metric_name,
+            'value': value,
+            'unit': unit,
+            'context': context
+        })
     
-    def get_dashboard_data(self) -> Dict:
-        """Get comprehensive dashboard data from all logging tables"""
-        data = {}
-        
-        # Get latest run summary
-        latest_run_query = """
-        SELECT * FROM migration_runs 
-        ORDER BY start_time DESC 
-        LIMIT 1
-        """
-        
-        with self.engine.connect() as conn:
-            result = conn.execute(text(latest_run_query))
-            latest_run = result.fetchone()
+    # ---------------- Write Connection ----------------
+    def _get_conn(self):
+        """Shared write connection, opened on first use (caller holds _conn_lock)"""
+        if self._conn is None or self._conn.closed:
+            self._conn = self.engine.connect()
+        return self._conn
+    
+    def _write(self, fn):
+        """Run fn(conn) on the shared connection and commit"""
+        with self._conn_lock:
+            conn = self._get_conn()
+            try:
+                fn(conn)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+    
+    def _execute(self, query, params):
+        self._write(lambda conn: conn.execute(query, params))
+    
+    def close(self):
+        """Flush the queue and release the write connection"""
+        self._flush_all()
+        with self._conn_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    # ---------------- Background Writer ----------------
+    def _buffer(self, table: str, params: Dict):
+        """Queue one row for the writer thread (blocks only if the queue is full)"""
+        self._q.put((table, params))
+    
+    def _writer(self):
+        """Collect up to _buffer_limit rows (or LOG_FLUSH_INTERVAL) and write them per table"""
+        while True:
+            batch = [self._q.get()]
+            deadline = time.monotonic() + LOG_FLUSH_INTERVAL
+            # A flush marker (table None) ends the batch so its waiter isn't held up
+            while len(batch) < self._buffer_limit and batch[-1][0] is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._q.get(timeout=remaining))
+                except queue.Empty:
+                    break
             
-            if latest_run:
-                data['latest_run'] = {
-                    'run_id': latest_run[0],
-                    'run_type': latest_run[1],
-                    'start_time': latest_run[2].isoformat() if latest_run[2] else None,
-                    'end_time': latest_run[3].isoformat() if latest_run[3] else None,
-                    'status': latest_run[4],
-                    'total_servers': latest_run[5],
-                    'total_databases': latest_run[6],
-                    'total_tables': latest_run[7],
-                    'total_rows_processed': latest_run[8],
-                    'total_rows_inserted': latest_run[9],
-                    'successful_syncs': latest_run[10],
-                    'failed_syncs': latest_run[11]
-                }
-        
-        # Get recent runs (last 10)
-        recent_runs_query = """
-        SELECT run_id, run_type, start_time, end_time, status, total_rows_inserted, successful_syncs, failed_syncs
-        FROM migration_runs 
-        ORDER BY start_time DESC 
-        LIMIT 10
+            grouped = {}
+            markers = []
+            for table, params in batch:
+                if table is None:
+                    markers.append(params)
+                else:
+                    grouped.setdefault(table, []).append(params)
+            try:
+                for table, rows in grouped.items():
+                    try:
+                        self._write_rows(table, rows)
+                    except Exception as e:
+                        # Lose this group, not the thread: later flushes would never be answered
+                        logging.error(f"Log writer dropped {len(rows)} rows for {table}: {e}")
+            finally:
+                # Everything queued before these markers has now been written
+                for done in markers:
+                    done.set()
+    
+    def _flush_all(self, timeout=LOG_FLUSH_TIMEOUT):
         """
-        
-        with self.engine.connect() as conn:
-            result = conn.execute(text(recent_runs_query))
-            data['recent_runs'] = [
-                {
-                    'run_id': row[0],
-                    'run_type': row[1],
-                    'start_time': row[2].isoformat() if row[2] else None,
-                    'end_time': row[3].isoformat() if row[3] else None,
-                    'status': row[4],
-                    'total_rows_inserted': row[5],
-                    'successful_syncs': row[6],
-                    'failed_syncs': row[7]
-                }
-                for row in result.fetchall()
-            ]
-        
-        # Get active alerts
-        alerts_query = """
-        SELECT alert_type, severity, server_name, database_name, table_name, alert_message, alert_timestamp
-        FROM alerts 
-        WHERE is_resolved = FALSE 
-        ORDER BY alert_timestamp DESC 
-        LIMIT 20
+        Wait until the rows queued before this call are written (run end, before
+        reads and at exit). Rows other threads queue meanwhile don't extend the wait.
         """
+        done = threading.Event()
+        try:
+            self._q.put((None, done), timeout=timeout)
+        except queue.Full:
+            logging.warning(f"Log queue still full after {timeout}s, not waiting for the writer")
+            return
+        if not done.wait(timeout):
+            logging.warning(f"Log writer still busy after {timeout}s, continuing")
+    
+    def _write_rows(self, table: str, rows: List[Dict]):
+        """One executemany round-trip and one commit for the whole batch"""
+        # JSONB payloads are queued as dicts and serialized here, off the ETL thread
+        for column in JSON_COLUMNS.get(table, ()):
+            for row in rows:
+                row[column] = _to_json(row[column])
+        if table in COPY_COLUMNS:
+            try:
+                self._copy_rows(table, rows)
+                return
+            except Exception as e:
+                logging.warning(f"COPY into {table} failed, falling back to INSERT: {e}")
+        self._insert_rows(table, rows)
+    
+    def _insert_rows(self, table: str, rows: List[Dict]):
+        """INSERT the batch; on failure split it in halves so only the bad rows are dropped"""
+        try:
+            self._execute(BUFFERED_INSERTS[table], rows)
+        except Exception as e:
+            if len(rows) == 1:
+                logging.error(f"Rejected log row for {table}: {rows[0]} ({e})")
+                return
+            middle = len(rows) // 2
+            self._insert_rows(table, rows[:middle])
+            self._insert_rows(table, rows[middle:])
+    
+    def _copy_rows(self, table: str, rows: List[Dict]):
+        """Stream a batch through COPY FROM STDIN (CSV, NULL written as \\N)"""
+        columns = COPY_COLUMNS[table]
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for row in rows:
+            writer.writerow(['\\N' if row[key] is None else row[key] for _, key in columns])
+        buf.seek(0)
         
-        with self.engine.connect() as conn:
-            result = conn.execute(text(alerts_query))
-            data['active_alerts'] = [
-                {
-                    'alert_type': row[0],
-                    'severity': row[1],
-                    'server_name': row[2],
-                    'database_name': row[3],
-                    'table_name': row[4],
-                    'message': row[5],
-                    'timestamp': row[6].isoformat() if row[6] else None
-                }
-                for row in result.fetchall()
-            ]
-        
-        # Get data consistency issues
-        consistency_query = """
-        SELECT server_name, database_name, table_name, source_row_count, target_row_count, 
-               missing_rows, consistency_percentage, audit_status
-        FROM row_count_audit 
-        WHERE audit_status IN ('FAIL', 'WARNING')
-        ORDER BY audit_timestamp DESC 
-        LIMIT 20
-        """
+        sql = f"COPY {table} ({', '.join(col for col, _ in columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+        self._write(lambda conn: conn.connection.cursor().copy_expert(sql, buf))
+    
+    def get_dashboard_data(self) -> Dict:
+        """Get comprehensive dashboard data from all logging tables"""
+        self._flush_all(timeout=DASHBOARD_FLUSH_TIMEOUT)
         
         with self.engine.connect() as conn:
-            result = conn.execute(text(consistency_query))
-            data['consistency_issues'] = [
-                {
-                    'server_name': row[0],
-                    'database_name': row[1],
-                    'table_name': row[2],
-                    'source_count': row[3],
-                    'target_count': row[4],
-                    'missing_rows': row[5],
-                    'consistency_percentage': float(row[6]) if row[6] else 0,
-                    'status': row[7]
-                }
-                for row in result.fetchall()
-            ]
+            latest_run, recent_runs, active_alerts, consistency_issues, system_health = \
+                conn.execute(DASHBOARD_SQL).fetchone()
         
-        # Get system health metrics
-        health_query = """
-        SELECT metric_name, metric_value, metric_unit, metric_timestamp
-        FROM system_health_metrics 
-        WHERE run_id = (SELECT run_id FROM migration_runs ORDER BY start_time DESC LIMIT 1)
-        ORDER BY metric_timestamp DESC 
-        LIMIT 10
-        """
-        
-        with self.engine.connect() as conn:
-            result = conn.execute(text(health_query))
-            data['system_health'] = [
-                {
-                    'metric_name': row[0],
-                    'value': float(row[1]) if row[1] else 0,
-                    'unit': row[2],
-                    'timestamp': row[3].isoformat() if row[3] else None
-                }
-                for row in result.fetchall()
-            ]
+        data = {}
+        if latest_run:
+            data['latest_run'] = latest_run
+        data['recent_runs'] = recent_runs
+        data['active_alerts'] = active_alerts
+        for issue in consistency_issues:
+            issue.pop('audit_timestamp', None)
+        data['consistency_issues'] = consistency_issues
+        data['system_health'] = system_health
         
         return data
 
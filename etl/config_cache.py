@@ -0,0 +1,77 @@
+"""Parsed YAML config shared by the ETL modules, re-parsed only when the file changes."""
+import os
+import copy
+import marshal
+import functools
+import tempfile
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+# Parsed config is also kept in "<config>.cache" so fresh processes
+# (every sync / dashboard run) skip the YAML parse too. marshal, not pickle:
+# loading it only builds plain data, it can't run code from the file
+USE_SIDECAR = os.environ.get("CONFIG_SIDECAR_CACHE", "1") == "1"
+
+def _read_sidecar(path, mtime, size):
+    try:
+        with open(path + ".cache", "rb") as f:
+            cached_mtime, cached_size, data = marshal.load(f)
+    except Exception:
+        return None
+    if cached_mtime != mtime or cached_size != size:
+        return None
+    return data
+
+def _write_sidecar(path, mtime, size, data):
+    # Written next to the config and renamed into place; never fatal (read-only dirs etc.)
+    try:
+        # Raises ValueError for what marshal can't hold (YAML timestamps); those configs get no sidecar
+        payload = marshal.dumps((mtime, size, data))
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, path + ".cache")
+    except (OSError, ValueError):
+        pass
+
+@functools.lru_cache(maxsize=16)
+def _parse(path, mtime, size):
+    # (path, mtime, size) is the cache key: an edited file gets a fresh entry
+    if USE_SIDECAR:
+        data = _read_sidecar(path, mtime, size)
+        if data is not None:
+            return data
+    with open(path, "r") as f:
+        data = yaml.load(f, Loader=SafeLoader) or {}
+    if USE_SIDECAR:
+        _write_sidecar(path, mtime, size, data)
+    return data
+
+@functools.lru_cache(maxsize=16)
+def _derive(build, path, mtime, size):
+    return build(_parse(path, mtime, size), mtime, size)
+
+def get_derived(path, build):
+    """
+    build(parsed, mtime, size) for the YAML at `path`, computed once per file
+    change. The parsed tree passed to build is the cached one: don't mutate it.
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    return _derive(build, path, st.st_mtime, st.st_size)
+
+def invalidate():
+    """Forget every cached parse (after writing a config: mtime granularity can hide a same-size rewrite)."""
+    _derive.cache_clear()
+    _parse.cache_clear()
+
+def get_config(path):
+    """Return the parsed YAML at `path`, served from memory while the file is unchanged."""
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    # Callers mutate their config, so never hand out the cached tree itself
+    return copy.deepcopy(_parse(path, st.st_mtime, st.st_size))
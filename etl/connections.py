@@ -0,0 +1,137 @@
+"""Bounded per-server pools of pyodbc connections."""
+import os
+import queue
+import logging
+import functools
+import threading
+from contextlib import contextmanager
+
+@functools.lru_cache(maxsize=None)
+def _pyodbc():
+    """Import pyodbc (and load the ODBC driver manager) on first use."""
+    import pyodbc
+    # Let the driver manager pool handles too; must be set before the first connect
+    pyodbc.pooling = True
+    return pyodbc
+
+@functools.lru_cache(maxsize=256)
+def _conn_str_parts(server_host, username, password):
+    """(before, after) the DATABASE= slot; built once per server's credentials."""
+    return (
+        "DRIVER={ODBC Driver 18 for SQL Server};"
+        f"SERVER={server_host};",
+        f"UID={username};PWD={password};"
+        "TrustServerCertificate=yes;Encrypt=no;"
+    )
+
+def build_conn_str(conf, database=None):
+    """Canonical SQL Server connection string for a server entry.
+
+    ODBC pooling matches connection strings byte for byte, so every caller
+    should use this one layout (Driver 18; TLS off on the trusted network).
+    """
+    before, after = _conn_str_parts(
+        conf.get("server", "localhost"), conf.get("username", "sa"), conf.get("password", "root")
+    )
+    if database:
+        return f"{before}DATABASE={database};{after}"
+    return before + after
+
+# Run on every new session: no DONE_IN_PROC row-count messages between result
+# sets, and ARITHABORT ON so plans match what SSMS (and indexed views) use
+SESSION_PRELUDE = "SET NOCOUNT ON; SET ARITHABORT ON;"
+
+def connect(conn_str, **kwargs):
+    """pyodbc.connect with driver-manager pooling enabled, for callers outside the pools below."""
+    conn = _pyodbc().connect(conn_str, **kwargs)
+    conn.cursor().execute(SESSION_PRELUDE).close()
+    return conn
+
+POOL_SIZE = int(os.environ.get("SQL_POOL_SIZE", 10))   # open connections per server
+CONNECT_TIMEOUT = 5      # login timeout, seconds
+CHECKOUT_TIMEOUT = 30
+
+class _Pool:
+    def __init__(self, conn_str):
+        self.conn_str = conn_str
+        self.idle = queue.LifoQueue(maxsize=POOL_SIZE)   # most recently used first
+        self.slots = threading.BoundedSemaphore(POOL_SIZE)
+
+_pools = {}              # server_name -> _Pool
+_pools_lock = threading.Lock()
+
+def _close_quietly(conn):
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+def _drain(pool):
+    while True:
+        try:
+            _close_quietly(pool.idle.get_nowait())
+        except queue.Empty:
+            return
+
+def _get_pool(server_name, conn_str):
+    with _pools_lock:
+        pool = _pools.get(server_name)
+        if pool is None or pool.conn_str != conn_str:
+            if pool is not None:
+                # Credentials changed in the YAML
+                _drain(pool)
+            pool = _Pool(conn_str)
+            _pools[server_name] = pool
+    return pool
+
+def _checkout(pool, server_name):
+    pyodbc = _pyodbc()
+    try:
+        conn = pool.idle.get_nowait()
+    except queue.Empty:
+        conn = None
+    if conn is not None:
+        try:
+            conn.cursor().execute("SELECT 1").fetchall()
+            return conn
+        except pyodbc.Error as e:
+            logging.debug(f"Dropping dead connection for {server_name}: {e}")
+            _close_quietly(conn)
+    # timeout= is the login timeout; queries keep pyodbc's default of no limit
+    return connect(pool.conn_str, timeout=CONNECT_TIMEOUT, autocommit=True)
+
+@contextmanager
+def get_conn(server_name, conn_str, query_timeout=0):
+    """
+    Borrow a validated connection to `server_name`, returning it to the pool
+    afterwards. At most POOL_SIZE connections per server are open at once;
+    pyodbc connections are never shared between threads while checked out.
+    query_timeout is the per-statement limit in seconds (0 = none), reset on
+    every checkout so one borrower's limit never leaks to the next.
+    """
+    pool = _get_pool(server_name, conn_str)
+    if not pool.slots.acquire(timeout=CHECKOUT_TIMEOUT):
+        raise TimeoutError(f"No free connection to {server_name} after {CHECKOUT_TIMEOUT}s")
+    try:
+        conn = _checkout(pool, server_name)
+        conn.timeout = query_timeout
+        try:
+            yield conn
+        except Exception:
+            # State unknown after a failure, don't hand it to the next caller
+            _close_quietly(conn)
+            raise
+        if _pools.get(server_name) is pool:
+            pool.idle.put_nowait(conn)
+        else:
+            _close_quietly(conn)
+    finally:
+        pool.slots.release()
+
+def close_all():
+    """Close every idle pooled connection (e.g. at shutdown)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        _drain(pool)
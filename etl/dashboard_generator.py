@@ -11,15 +11,27 @@ import logging
 from datetime import datetime, timedelta
 from pathlib import Path
 import webbrowser
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import HTTPServer, BaseHTTPRequestHandler
 import threading
 import time
+from collections import Counter
 
 # Add the current directory to Python path
 sys.path.append(os.path.dirname(__file__))
 
 from monitoring import MigrationMonitor
 
+class OneShotHandler(BaseHTTPRequestHandler):
+    """Serves the in-memory dashboard for every path; nothing is read from disk"""
+    html = b""
+    
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(self.html)))
+        self.end_headers()
+        self.wfile.write(self.html)
+
 class DashboardServer:
     """Simple HTTP server to serve the dashboard"""
     
@@ -27,21 +39,16 @@ class DashboardServer:
         self.port = port
         self.server = None
         
-    def start(self, html_content):
-        """Start the dashboard server"""
-        # Create temporary HTML file
-        dashboard_path = Path("migration_dashboard.html")
-        with open(dashboard_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        # Start HTTP server in current directory
-        self.server = HTTPServer(('localhost', self.port), SimpleHTTPRequestHandler)
+    def start(self, html_bytes):
+        """Start the dashboard server (html_bytes: the page, already UTF-8 encoded)"""
+        # Served straight from memory, so no directory is exposed
+        handler = type('DashboardHandler', (OneShotHandler,), {'html': html_bytes})
+        self.server = HTTPServer(('localhost', self.port), handler)
         
         print(f"🚀 Dashboard server starting on http://localhost:{self.port}")
-        print(f"📊 Dashboard file: {dashboard_path.absolute()}")
         
         # Open browser
-        webbrowser.open(f'http://localhost:{self.port}/migration_dashboard.html')
+        webbrowser.open(f'http://localhost:{self.port}/')
         
         # Start server in background thread
         server_thread = threading.Thread(target=self.server.serve_forever)
@@ -83,9 +90,10 @@ def generate_metrics_summary(monitor):
     elif success_rate < 95 or consistency_score < 98:
         summary['overall_health'] = 'WARNING'
     
-    # Count issues
-    summary['critical_issues'] = len([a for a in active_alerts if a['severity'] == 'HIGH'])
-    summary['warnings'] = len([a for a in active_alerts if a['severity'] == 'MEDIUM'])
+    # Count issues (one pass over the alerts)
+    severity_counts = Counter(a['severity'] for a in active_alerts)
+    summary['critical_issues'] = severity_counts['HIGH']
+    summary['warnings'] = severity_counts['MEDIUM']
     
     # Generate recommendations
     if success_rate < 95:
@@ -134,10 +142,10 @@ def main():
         
         print("\n" + "="*60)
         
-        # Save dashboard to file
+        # Save dashboard to file; the same bytes are served below
+        html_bytes = html_content.encode('utf-8')
         dashboard_path = Path("migration_dashboard.html")
-        with open(dashboard_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        dashboard_path.write_bytes(html_bytes)
         
         print(f"💾 Dashboard saved to: {dashboard_path.absolute()}")
         
@@ -147,7 +155,7 @@ def main():
         if response in ['y', 'yes']:
             try:
                 server = DashboardServer()
-                server.start(html_content)
+                server.start(html_bytes)
                 
                 print("\n🎉 Dashboard is now running!")
                 print("📱 Open your browser to view the interactive dashboard")
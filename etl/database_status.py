@@ -1,4 +1,4 @@
-import pyodbc
+from connections import build_conn_str, connect
 
 def check_all_databases(server_config):
     """
@@ -7,52 +7,32 @@ def check_all_databases(server_config):
     Returns: dict of {dbName: {'status': 'up'/'down', 'error': ...}}
     """
     result = {}
-    skip_dbs = server_config.get("skip_databases", [])
+    skip_dbs = frozenset(server_config.get("skip_databases") or ())
 
     try:
         # Connect to master database to list all databases
-        conn_str = (
-            f"DRIVER={{ODBC Driver 18 for SQL Server}};"
-            f"SERVER={server_config['server']};"
-            f"DATABASE=master;"
-            f"UID={server_config['username']};"
-            f"PWD={server_config['password']};"
-            "TrustServerCertificate=yes;"
-            "Encrypt=no;"
-        )
-        conn = pyodbc.connect(conn_str, timeout=5)
+        conn = connect(build_conn_str(server_config, "master"), timeout=5)
         cursor = conn.cursor()
-        
-        # Get all user databases
+
+        # SQL Server already tracks each database's state: one query instead of a login per database.
+        # HAS_DBACCESS stands in for "this login could open it".
         cursor.execute("""
-            SELECT name 
+            SELECT name, state_desc, HAS_DBACCESS(name)
             FROM sys.databases 
             WHERE database_id > 4
         """)
-        db_list = [row[0] for row in cursor.fetchall()]
+        rows = cursor.fetchall()
         conn.close()
 
-        for db_name in db_list:
+        for db_name, state_desc, has_access in rows:
             if db_name in skip_dbs:
                 continue
-            try:
-                # Check individual database
-                conn_str_db = (
-                    f"DRIVER={{ODBC Driver 18 for SQL Server}};"
-                    f"SERVER={server_config['server']};"
-                    f"DATABASE={db_name};"
-                    f"UID={server_config['username']};"
-                    f"PWD={server_config['password']};"
-                    "TrustServerCertificate=yes;"
-                    "Encrypt=no;"
-                )
-                conn_db = pyodbc.connect(conn_str_db, timeout=5)
-                cursor_db = conn_db.cursor()
-                cursor_db.execute("SELECT 1")
-                conn_db.close()
+            if state_desc != "ONLINE":
+                result[db_name] = {"status": "down", "error": state_desc}
+            elif has_access != 1:
+                result[db_name] = {"status": "down", "error": "Login has no access to this database"}
+            else:
                 result[db_name] = {"status": "up"}
-            except Exception as e:
-                result[db_name] = {"status": "down", "error": str(e)}
 
     except Exception as e:
         # If we cannot connect to the server at all
@@ -1,41 +1,146 @@
+import io
 import os
-import yaml
-import pyodbc
-import pandas as pd
+import csv
+import gzip
+import json
+import queue
+import atexit
+import time
+import tempfile
+import datetime
+import decimal
+import functools
+import threading
+from collections import OrderedDict
+from config_cache import get_config
 import logging
+import multiprocessing
+import multiprocessing.util
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from connections import build_conn_str, connect, get_conn, POOL_SIZE
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('extract_sqlserver.log'),
-        logging.StreamHandler()
-    ]
-)
+# Set up logging: callers only enqueue records, a listener thread does the file/console I/O
+_log_listener = None
+
+def setup_logging(prefix=''):
+    """(Re)start the queue-based logging for this process; prefix goes before every message"""
+    global _log_listener
+    stop_logging()
+    formatter = logging.Formatter(f"%(asctime)s - %(levelname)s - {prefix.replace('%', '%%')}%(message)s")
+    handlers = [logging.FileHandler('extract_sqlserver.log'), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    # Replace the QueueHandler left by an earlier call (e.g. at import in a spawned worker)
+    for handler in list(root.handlers):
+        if isinstance(handler, QueueHandler):
+            root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+    _log_listener = QueueListener(log_queue, *handlers)
+    _log_listener.start()
+
+def stop_logging():
+    """Drain queued records and stop the listener"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+def _init_worker_process(server_name):
+    """ProcessPoolExecutor initializer: own listener, flushed when the worker exits"""
+    setup_logging(f"[{server_name}] ")
+    # Pool workers leave via os._exit, which skips atexit; multiprocessing finalizers still run
+    multiprocessing.util.Finalize(None, stop_logging, exitpriority=10)
+
+class _ServerLog(logging.LoggerAdapter):
+    """Prefixes messages with the server name, so servers running side by side stay greppable"""
+    def process(self, msg, kwargs):
+        return f"[{self.extra['server']}] {msg}", kwargs
+
+setup_logging()
+atexit.register(stop_logging)
 
 # Load DB connection info from YAML
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), '../config/db_connections.yaml')
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '../data/sqlserver_exports/')
 
-with open(CONFIG_PATH, 'r') as f:
-    config = yaml.safe_load(f)
+config = get_config(CONFIG_PATH)
+
+# Rows fetched per round-trip while streaming a table out
+EXPORT_BATCH_ROWS = int(os.environ.get("EXPORT_BATCH_ROWS", "50000"))
+# Tables exported side by side per database; each worker holds one pooled connection
+EXPORT_WORKERS = min(int(os.environ.get("EXPORT_WORKERS", "8")), POOL_SIZE)
+# SQL Server instances exported side by side (each runs its own database process pool)
+SERVER_WORKERS = int(os.environ.get("SERVER_WORKERS", "8"))
+# Databases exported in separate processes (CSV formatting is CPU-bound);
+# each process opens up to EXPORT_WORKERS connections, so keep this modest
+DB_WORKERS = int(os.environ.get("DB_WORKERS", str(min(os.cpu_count() or 1, 4))))
+# Ceiling on export sessions across all servers (servers x databases x tables in
+# flight); DB_WORKERS is lowered per server to stay under it
+MAX_SQL_SESSIONS = int(os.environ.get("MAX_SQL_SESSIONS", "64"))
+
+# 'csv' (what load_postgres reads) or 'parquet' (needs pyarrow; zstd-compressed, columnar)
+EXPORT_FORMAT = (os.environ.get("EXPORT_FORMAT") or config.get('export_format') or 'csv').lower()
+
+# CSV exports: 'gzip' writes <table>.csv.gz at compresslevel 1 (load_postgres reads both)
+EXPORT_COMPRESSION = (os.environ.get("EXPORT_COMPRESSION") or config.get('export_compression') or '').lower()
+WRITE_BUFFER_BYTES = 16 << 20
+
+# Table lists are cached on disk per server/database for up to TABLE_CACHE_TTL
+# seconds, and dropped as soon as sys.tables changes
+TABLE_CACHE_DIR = os.environ.get("ETL_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "etl")
+TABLE_CACHE_TTL = int(os.environ.get("TABLE_CACHE_TTL", "3600"))
+REFRESH_METADATA = os.environ.get("REFRESH_METADATA") == "1"
 
 # Ensure output directory exists
 Path(OUTPUT_DIR).mkdir(parents=True, exist_ok=True)
 
+# Per-thread cache of direct connections: conn_str -> (conn, last_used).
+# An entry used within CONN_REUSE_SECONDS is handed back without a probe query;
+# older ones are closed and reopened. Callers evict on error.
+CONN_REUSE_SECONDS = 300
+CONN_CACHE_SIZE = 8
+_local = threading.local()
+
+def _thread_conns():
+    conns = getattr(_local, 'conns', None)
+    if conns is None:
+        conns = _local.conns = OrderedDict()
+    return conns
+
+def _close_quietly(conn):
+    try:
+        conn.close()
+    except Exception:
+        pass
+
 def get_connection(conf, database=None):
-    """Get connection to SQL Server, optionally to a specific database"""
-    conn_str = (
-        f"DRIVER={{ODBC Driver 17 for SQL Server}};"
-        f"SERVER={conf['server']};"
-        f"UID={conf['username']};"
-        f"PWD={conf['password']}"
-    )
-    if database:
-        conn_str += f";DATABASE={database}"
-    return pyodbc.connect(conn_str)
+    """Get connection to SQL Server, optionally to a specific database (reused per thread)"""
+    conn_str = build_conn_str(conf, database)
+    conns = _thread_conns()
+    now = time.monotonic()
+    entry = conns.pop(conn_str, None)
+    if entry is not None and now - entry[1] < CONN_REUSE_SECONDS:
+        conn = entry[0]
+    else:
+        if entry is not None:
+            _close_quietly(entry[0])
+        conn = connect(conn_str)
+    conns[conn_str] = (conn, now)
+    while len(conns) > CONN_CACHE_SIZE:
+        _, (old, _) = conns.popitem(last=False)
+        _close_quietly(old)
+    return conn
+
+def evict_connection(conf, database=None):
+    """Drop (and close) this thread's cached connection, e.g. after an ODBC error"""
+    entry = _thread_conns().pop(build_conn_str(conf, database), None)
+    if entry is not None:
+        _close_quietly(entry[0])
 
 def get_all_databases(conn):
     """Get list of all user databases on the server"""
@@ -57,42 +162,105 @@ def get_all_databases(conn):
     
     return databases
 
-def get_table_row_count(conn, schema, table):
-    """Get row count for a table"""
+def get_table_row_counts(conn):
+    """Row counts of every table in the connection's database, from catalog metadata (no scans)"""
+    query = """
+    SELECT s.name, t.name, SUM(p.row_count)
+    FROM sys.tables t
+    JOIN sys.schemas s ON t.schema_id = s.schema_id
+    JOIN sys.dm_db_partition_stats p ON p.object_id = t.object_id
+    WHERE p.index_id IN (0, 1)
+    GROUP BY s.name, t.name
+    """
     try:
-        query = f"SELECT COUNT(*) FROM [{schema}].[{table}]"
         cursor = conn.cursor()
         cursor.execute(query)
-        return cursor.fetchone()[0]
+        return {(schema, table): rows for schema, table, rows in cursor.fetchall()}
     except Exception as e:
-        logging.warning(f"Could not get row count for {schema}.{table}: {e}")
-        return 0
+        # dm_db_partition_stats needs VIEW DATABASE STATE
+        logging.warning(f"Could not read row counts: {e}")
+        return {}
+
+TABLE_STAMP_SQL = "SELECT COUNT(*), MAX(modify_date) FROM sys.tables"
 
-def list_tables(conn):
+def _table_stamp(conn):
+    """Changes whenever a table is created, dropped or altered; a cheap catalog read"""
     cursor = conn.cursor()
-    tables = []
-    for row in cursor.tables(tableType='TABLE'):
-        tables.append((row.table_schem, row.table_name))
-    return tables
+    count, modified = cursor.execute(TABLE_STAMP_SQL).fetchone()
+    cursor.close()
+    return [count, str(modified)]
 
-def should_skip_database(db_name, conf):
-    """Check if database should be skipped"""
-    skip_databases = conf.get('skip_databases', [])
-    
-    # If skip_databases is empty or not present, migrate ALL databases
-    if not skip_databases:
-        return False
+def list_tables(conn, server_name=None, db_name=None):
+    """(schema, table) pairs; with server/db given, served from the on-disk cache while fresh"""
+    cache_path = stamp = None
+    if server_name and db_name and TABLE_CACHE_TTL > 0:
+        cache_path = os.path.join(TABLE_CACHE_DIR, f"{server_name}_{db_name}.tables.json")
+        # The stamp check catches new tables long before the TTL runs out
+        stamp = _table_stamp(conn)
+        tables = _read_table_cache(cache_path, stamp)
+        if tables is not None:
+            return tables
     
-    # Only skip databases explicitly listed in config
-    if db_name in skip_databases:
-        logging.info(f"Skipping database: {db_name} (listed in skip_databases)")
-        return True
+    # One server-side filtered query instead of the ODBC catalog function
+    cursor = conn.cursor()
+    cursor.execute("""
+    SELECT TABLE_SCHEMA, TABLE_NAME
+    FROM INFORMATION_SCHEMA.TABLES
+    WHERE TABLE_TYPE = 'BASE TABLE'
+    AND TABLE_SCHEMA NOT IN ('sys', 'INFORMATION_SCHEMA')
+    """)
+    tables = [(schema, table) for schema, table in cursor.fetchall()]
     
-    return False
+    if cache_path:
+        _write_table_cache(cache_path, stamp, tables)
+    return tables
+
+def _read_table_cache(cache_path, stamp):
+    if REFRESH_METADATA:
+        return None
+    try:
+        if time.time() - os.path.getmtime(cache_path) >= TABLE_CACHE_TTL:
+            return None
+        with open(cache_path, 'r') as f:
+            cached = json.load(f)
+        if cached['stamp'] != stamp:
+            return None
+        return [tuple(t) for t in cached['tables']]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def _write_table_cache(cache_path, stamp, tables):
+    # Written to a temp file and renamed, so a concurrent reader never sees half a file
+    try:
+        os.makedirs(TABLE_CACHE_DIR, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=TABLE_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'stamp': stamp, 'tables': tables}, f)
+        os.replace(tmp, cache_path)
+    except OSError as e:
+        logging.warning(f"Could not write table cache {cache_path}: {e}")
+
+def _open_export(filepath):
+    """Text handle for a CSV export with a large write buffer (few, big write() calls)."""
+    if filepath.endswith('.gz'):
+        # Level 1: most of the size win for a fraction of the CPU of the default 9
+        raw = gzip.open(filepath, 'wb', compresslevel=1)
+        return io.TextIOWrapper(io.BufferedWriter(raw, WRITE_BUFFER_BYTES), encoding='utf-8', newline='')
+    return open(filepath, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_BYTES)
+
+def _export_query(schema, table, empty):
+    """SELECT for an export; TOP 0 when the table is known to be empty (header/schema only)."""
+    return f"SELECT {'TOP 0 ' if empty else ''}* FROM [{schema}].[{table}]"
+
+def table_is_empty(conn, schema, table):
+    """Exact emptiness check (the partition-stats row counts are approximate); reads at most one row"""
+    cursor = conn.cursor()
+    row = cursor.execute(f"SELECT TOP 1 1 FROM [{schema}].[{table}]").fetchone()
+    cursor.close()
+    return row is None
 
-def export_table_to_csv(conn, schema, table, output_dir, server_name, db_name):
-    query = f"SELECT * FROM [{schema}].[{table}]"
-    df = pd.read_sql(query, conn)
+def export_table_to_csv(conn, schema, table, output_dir, server_name, db_name, empty=False):
+    query = _export_query(schema, table, empty)
     
     # Create subdirectory for this server/database
     server_dir = os.path.join(output_dir, f"{server_name}_{db_name}")
@@ -100,48 +268,171 @@ def export_table_to_csv(conn, schema, table, output_dir, server_name, db_name):
     
     filename = f"{schema}_{table}.csv"
     filepath = os.path.join(server_dir, filename)
-    df.to_csv(filepath, index=False)
-    logging.info(f"Exported {schema}.{table} to {filepath} ({len(df)} rows)")
+    if EXPORT_COMPRESSION == 'gzip':
+        filepath += '.gz'
+    
+    # Stream rows straight from the cursor into the file; no DataFrame in between
+    cursor = conn.cursor()
+    cursor.arraysize = EXPORT_BATCH_ROWS
+    cursor.execute(query)
+    row_count = 0
+    with _open_export(filepath) as f:
+        writer = csv.writer(f)
+        writer.writerow([col[0] for col in cursor.description])
+        while True:
+            rows = cursor.fetchmany(EXPORT_BATCH_ROWS)
+            if not rows:
+                break
+            writer.writerows(rows)
+            row_count += len(rows)
+    cursor.close()
+    logging.info(f"Exported {schema}.{table} to {filepath} ({row_count} rows)")
+
+@functools.lru_cache(maxsize=None)
+def _pyarrow():
+    """(pyarrow, pyarrow.parquet), imported on first parquet export; None if not installed."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        logging.warning("EXPORT_FORMAT=parquet but pyarrow is not installed; exporting CSV")
+        return None
+    return pyarrow, pyarrow.parquet
+
+def _arrow_type(pa, column):
+    """Arrow type for a cursor.description entry, so every batch shares one schema."""
+    _, type_code, _, _, precision, scale, _ = column
+    if type_code is bool:
+        return pa.bool_()
+    if type_code is int:
+        return pa.int64()
+    if type_code is float:
+        return pa.float64()
+    if type_code is decimal.Decimal:
+        return pa.decimal128(precision or 38, scale or 0)
+    if type_code is datetime.datetime:
+        return pa.timestamp('us')
+    if type_code is datetime.date:
+        return pa.date32()
+    if type_code is datetime.time:
+        return pa.time64('us')
+    if type_code in (bytes, bytearray):
+        return pa.binary()
+    return pa.string()
+
+def export_table_to_parquet(conn, schema, table, output_dir, server_name, db_name, empty=False):
+    pa, pq = _pyarrow()
+    query = _export_query(schema, table, empty)
+    
+    server_dir = os.path.join(output_dir, f"{server_name}_{db_name}")
+    Path(server_dir).mkdir(parents=True, exist_ok=True)
+    filepath = os.path.join(server_dir, f"{schema}_{table}.parquet")
+    
+    cursor = conn.cursor()
+    cursor.arraysize = EXPORT_BATCH_ROWS
+    cursor.execute(query)
+    arrow_schema = pa.schema([(col[0], _arrow_type(pa, col)) for col in cursor.description])
+    row_count = 0
+    # Each fetched batch becomes one row group, column by column
+    with pq.ParquetWriter(filepath, arrow_schema, compression='zstd', use_dictionary=True) as writer:
+        while True:
+            rows = cursor.fetchmany(EXPORT_BATCH_ROWS)
+            if not rows:
+                break
+            columns = list(zip(*rows))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, arrow_schema)],
+                schema=arrow_schema
+            ))
+            row_count += len(rows)
+    cursor.close()
+    logging.info(f"Exported {schema}.{table} to {filepath} ({row_count} rows)")
+
+def export_table(conn, schema, table, output_dir, server_name, db_name, empty=False):
+    """Export one table in EXPORT_FORMAT; empty=True skips the scan and writes just the columns."""
+    if EXPORT_FORMAT == 'parquet' and _pyarrow() is not None:
+        export_table_to_parquet(conn, schema, table, output_dir, server_name, db_name, empty)
+    else:
+        export_table_to_csv(conn, schema, table, output_dir, server_name, db_name, empty)
 
 def process_database(conn, db_name, server_conf, server_clean, output_dir):
     """Process a single database"""
     logging.info(f"Processing database: {db_name}")
     
-    tables = list_tables(conn)
+    tables = list_tables(conn, server_clean, db_name)
     if not tables:
         logging.warning(f"No tables found in {db_name}.")
         return 0, 0
     
+    # Biggest tables first, so the long exports start early and the small ones fill the gaps
+    row_counts = get_table_row_counts(conn)
+    tables = sorted(tables, key=lambda t: row_counts.get(t, 0), reverse=True)
+    logging.info(f"Database {db_name}: {len(tables)} tables, ~{sum(row_counts.values())} rows")
+    
     processed_count = 0
     skipped_count = 0
+    empty_count = 0
     
-    for schema, table in tables:
-        try:
-            export_table_to_csv(conn, schema, table, output_dir, server_clean, db_name)
-            processed_count += 1
-            
-        except Exception as e:
-            logging.error(f"Failed to export {schema}.{table}: {e}")
+    # Exports are independent round-trips: run them side by side, each on a pooled connection
+    pool_key = f"{server_conf['server']}/{db_name}"
+    conn_str = build_conn_str(server_conf, db_name)
     
-    logging.info(f"Database {db_name}: {processed_count} tables processed, {skipped_count} tables skipped")
+    def export_one(schema, table, empty):
+        # No statement limit: a big table's SELECT * can run for minutes
+        with get_conn(pool_key, conn_str, query_timeout=0) as table_conn:
+            # Stats said empty; confirm before writing a header-only file
+            empty = empty and table_is_empty(table_conn, schema, table)
+            export_table(table_conn, schema, table, output_dir, server_clean, db_name, empty)
+        return empty
+    
+    with ThreadPoolExecutor(max_workers=min(EXPORT_WORKERS, len(tables))) as executor:
+        futures = {}
+        for schema, table in tables:
+            # Empty tables only need their header: no full scan, no result set
+            empty = row_counts.get((schema, table)) == 0
+            futures[executor.submit(export_one, schema, table, empty)] = (schema, table)
+        for future in as_completed(futures):
+            schema, table = futures[future]
+            try:
+                empty = future.result()
+                processed_count += 1
+                if empty:
+                    empty_count += 1
+            except Exception as e:
+                logging.error(f"Failed to export {schema}.{table}: {e}")
+    
+    logging.info(f"Database {db_name}: {processed_count} tables processed ({empty_count} empty), {skipped_count} tables skipped")
     return processed_count, skipped_count
 
-def process_sql_server(server_name, server_conf):
+def process_database_entry(db_name, server_conf, server_clean, output_dir):
+    """Worker-process entry point: open this database's connection and export it"""
+    db_conn = get_connection(server_conf, db_name)
+    try:
+        return process_database(db_conn, db_name, server_conf, server_clean, output_dir)
+    except Exception:
+        evict_connection(server_conf, db_name)
+        raise
+
+def process_sql_server(server_name, server_conf, db_workers=DB_WORKERS):
     """Process a single SQL Server instance - all databases"""
+    log = _ServerLog(logging.getLogger(), {'server': server_name})
     try:
         # Connect to master database to get list of all databases
         master_conn = get_connection(server_conf)
-        logging.info(f"Connected to SQL Server: {server_conf['server']}")
+        log.info(f"Connected to SQL Server: {server_conf['server']}")
         
         # Get all databases
-        databases = get_all_databases(master_conn)
-        master_conn.close()
+        try:
+            databases = get_all_databases(master_conn)
+        except Exception:
+            evict_connection(server_conf)
+            raise
         
         if not databases:
-            logging.warning(f"No user databases found on {server_conf['server']}.")
+            log.warning(f"No user databases found on {server_conf['server']}.")
             return
         
-        logging.info(f"Found {len(databases)} databases on {server_conf['server']}")
+        log.info(f"Found {len(databases)} databases on {server_conf['server']}")
         
         # Clean server name for file paths
         server_clean = ''.join(c for c in server_conf['server'] if c.isalnum() or c in '_-')
@@ -151,30 +442,40 @@ def process_sql_server(server_name, server_conf):
         processed_dbs = 0
         skipped_dbs = 0
         
+        # Only databases explicitly listed in skip_databases are skipped
+        skip = frozenset(server_conf.get('skip_databases') or ())
+        to_process = []
         for db_name in databases:
-            # Check if database should be skipped
-            if should_skip_database(db_name, server_conf):
+            if db_name in skip:
+                log.info(f"Skipping database: {db_name} (listed in skip_databases)")
                 skipped_dbs += 1
                 continue
-            
-            try:
-                # Connect to specific database
-                db_conn = get_connection(server_conf, db_name)
-                processed, skipped = process_database(db_conn, db_name, server_conf, server_clean, OUTPUT_DIR)
-                db_conn.close()
-                
-                total_processed += processed
-                total_skipped += skipped
-                processed_dbs += 1
-                
-            except Exception as e:
-                logging.error(f"Error processing database {db_name}: {e}")
+            to_process.append(db_name)
         
-        logging.info(f"Completed {server_name}: {processed_dbs} databases processed, {skipped_dbs} databases skipped")
-        logging.info(f"Total: {total_processed} tables processed, {total_skipped} tables skipped")
+        # Each database writes to its own directory, so they can run in parallel processes
+        if to_process:
+            # spawn, not fork: this process has other threads holding ODBC handles and locks
+            with ProcessPoolExecutor(max_workers=min(db_workers, len(to_process)), mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=_init_worker_process, initargs=(server_name,)) as executor:
+                futures = {
+                    executor.submit(process_database_entry, db_name, server_conf, server_clean, OUTPUT_DIR): db_name
+                    for db_name in to_process
+                }
+                for future in as_completed(futures):
+                    db_name = futures[future]
+                    try:
+                        processed, skipped = future.result()
+                        total_processed += processed
+                        total_skipped += skipped
+                        processed_dbs += 1
+                    except Exception as e:
+                        log.error(f"Error processing database {db_name}: {e}")
+        
+        log.info(f"Completed {server_name}: {processed_dbs} databases processed, {skipped_dbs} databases skipped")
+        log.info(f"Total: {total_processed} tables processed, {total_skipped} tables skipped")
         
     except Exception as e:
-        logging.error(f"Error processing {server_name}: {e}")
+        log.error(f"Error processing {server_name}: {e}")
 
 def main():
     """Process all SQL servers in configuration"""
@@ -186,9 +487,19 @@ def main():
     
     logging.info(f"Starting extraction for {len(sqlservers)} SQL servers")
     
-    for server_name, server_conf in sqlservers.items():
+    # Servers are independent hosts: overlap their network waits
+    server_workers = min(SERVER_WORKERS, len(sqlservers))
+    db_workers = max(1, min(DB_WORKERS, MAX_SQL_SESSIONS // (server_workers * EXPORT_WORKERS)))
+    logging.info(f"Up to {server_workers * db_workers * EXPORT_WORKERS} export sessions "
+                 f"({server_workers} servers x {db_workers} databases x {EXPORT_WORKERS} tables)")
+    
+    def run(item):
+        server_name, server_conf = item
         logging.info(f"Processing SQL Server: {server_name}")
-        process_sql_server(server_name, server_conf)
+        process_sql_server(server_name, server_conf, db_workers)
+    
+    with ThreadPoolExecutor(max_workers=server_workers) as executor:
+        list(executor.map(run, sqlservers.items()))
     
     logging.info("Extraction complete for all servers.")
 
@@ -1,6 +1,9 @@
 import os
-import yaml
-import pyodbc
+import csv
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from config_cache import get_config
+from connections import build_conn_str, connect
 import pandas as pd
 import logging
 from pathlib import Path
@@ -8,7 +11,8 @@ from datetime import datetime
 from sqlalchemy import create_engine, text
 import psycopg2
 # Add import for shared loader
-from pg_loader import load_csv_to_postgres, validate_row_count
+from pg_copy import copy_rows
+from pg_loader import clean_identifier, copy_cursor_to_postgres, copy_df, load_csv_to_postgres, validate_row_count
 # Add import for comprehensive logging
 from comprehensive_logging import comprehensive_logger
 # ✅ Import the monitor instance for logging sync metrics and alerts
@@ -28,29 +32,27 @@ logging.basicConfig(
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), '../config/db_connections.yaml')
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '../data/sqlserver_exports/')
 
-with open(CONFIG_PATH, 'r') as f:
-    config = yaml.safe_load(f)
+def load_config():
+    """Parsed db_connections.yaml; main() calls this per run, re-parsing only after edits"""
+    return get_config(CONFIG_PATH)
+
+config = load_config()
 
 # Configuration for sync strategies
 SYNC_CONFIG = {
     'no_pk_strategy': 'smart_sync',  # Options: 'smart_sync', 'timestamp_sync', 'full_replace', 'full_append'
     'enable_audit_trail': True,      # Enable audit trail logging
-    'compliance_mode': True          # Enable compliance-friendly operations
+    'compliance_mode': True,         # Enable compliance-friendly operations
+    'fetch_batch_size': 10000,       # Rows per fetchmany while streaming a table into PostgreSQL
+    'table_workers': 8,              # Tables synced side by side per database (one SQL Server connection each)
+    'keep_csv_audit': False          # Also write streamed rows to <output_dir>/<server>_<db>/<schema>_<table>.csv
 }
 
 pg_conf = config['postgresql']
 
 def get_sql_connection(conf, database=None):
     """Get connection to SQL Server"""
-    conn_str = (
-        f"DRIVER={{ODBC Driver 17 for SQL Server}};"
-        f"SERVER={conf['server']};"
-        f"UID={conf['username']};"
-        f"PWD={conf['password']}"
-    )
-    if database:
-        conn_str += f";DATABASE={database}"
-    return pyodbc.connect(conn_str)
+    return connect(build_conn_str(conf, database))
 
 def get_pg_engine():
     """Get PostgreSQL engine"""
@@ -178,40 +180,23 @@ def get_all_databases(conn):
     
     return databases
 
-def should_skip_database(db_name, conf):
-    """Check if database should be skipped"""
-    skip_databases = conf.get('skip_databases', [])
-    
-    if not skip_databases:
-        return False
-    
-    if db_name in skip_databases:
-        logging.info(f"Skipping database: {db_name} (listed in skip_databases)")
-        return True
-    
-    return False
+# System views and tables that are never synced
+SKIP_TABLES = frozenset({
+    'sys.trace_xe_event_map',
+    'sys.trace_xe_action_map',
+})
 
 def should_skip_table(schema, table):
     """Check if table should be skipped"""
-    # Skip system views and tables
-    skip_tables = [
-        'sys.trace_xe_event_map',
-        'sys.trace_xe_action_map',
-        'sys.trace_xe_event_map',
-        'sys.trace_xe_action_map'
-    ]
-    
+    # Everything in the sys schema is skipped; most tables are not in it
+    if schema.lower() != 'sys':
+        return False
     table_full_name = f"{schema}.{table}"
-    if table_full_name in skip_tables:
+    if table_full_name in SKIP_TABLES:
         logging.info(f"Skipping system table: {table_full_name}")
-        return True
-    
-    # Skip tables starting with 'sys.'
-    if schema.lower() == 'sys':
+    else:
         logging.info(f"Skipping system schema table: {table_full_name}")
-        return True
-    
-    return False
+    return True
 
 def get_sync_status(engine, server_name, database_name):
     """Get sync status for a database"""
@@ -264,16 +249,16 @@ def update_sync_status(engine, server_name, database_name, sync_type, sync_statu
 def get_primary_key_info(conn, schema, table):
     """Get primary key information for a table"""
     try:
-        query = f"""
+        query = """
         SELECT COLUMN_NAME
         FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
-        WHERE TABLE_SCHEMA = '{schema}' 
-        AND TABLE_NAME = '{table}'
+        WHERE TABLE_SCHEMA = ? 
+        AND TABLE_NAME = ?
         AND CONSTRAINT_NAME LIKE 'PK_%'
         ORDER BY ORDINAL_POSITION
         """
         cursor = conn.cursor()
-        cursor.execute(query)
+        cursor.execute(query, schema, table)
         pk_columns = [row[0] for row in cursor.fetchall()]
         return pk_columns
     except Exception as e:
@@ -283,16 +268,16 @@ def get_primary_key_info(conn, schema, table):
 def get_timestamp_column(conn, schema, table):
     """Get timestamp or datetime column for incremental sync"""
     try:
-        query = f"""
+        query = """
         SELECT COLUMN_NAME
         FROM INFORMATION_SCHEMA.COLUMNS
-        WHERE TABLE_SCHEMA = '{schema}' 
-        AND TABLE_NAME = '{table}'
+        WHERE TABLE_SCHEMA = ? 
+        AND TABLE_NAME = ?
         AND DATA_TYPE IN ('datetime', 'datetime2', 'smalldatetime', 'timestamp')
         ORDER BY COLUMN_NAME
         """
         cursor = conn.cursor()
-        cursor.execute(query)
+        cursor.execute(query, schema, table)
         timestamp_columns = [row[0] for row in cursor.fetchall()]
         return timestamp_columns[0] if timestamp_columns else None
     except Exception as e:
@@ -302,22 +287,58 @@ def get_timestamp_column(conn, schema, table):
 def get_unique_identifier_column(conn, schema, table):
     """Get unique identifier column for incremental sync"""
     try:
-        query = f"""
+        query = """
         SELECT COLUMN_NAME
         FROM INFORMATION_SCHEMA.COLUMNS
-        WHERE TABLE_SCHEMA = '{schema}' 
-        AND TABLE_NAME = '{table}'
+        WHERE TABLE_SCHEMA = ? 
+        AND TABLE_NAME = ?
         AND DATA_TYPE IN ('uniqueidentifier', 'int', 'bigint')
         ORDER BY COLUMN_NAME
         """
         cursor = conn.cursor()
-        cursor.execute(query)
+        cursor.execute(query, schema, table)
         id_columns = [row[0] for row in cursor.fetchall()]
         return id_columns[0] if id_columns else None
     except Exception as e:
         logging.warning(f"Could not get unique identifier column for {schema}.{table}: {e}")
         return None
 
+TABLE_METADATA_SQL = """
+SELECT c.TABLE_SCHEMA, c.TABLE_NAME, c.COLUMN_NAME, c.DATA_TYPE, k.ORDINAL_POSITION
+FROM INFORMATION_SCHEMA.COLUMNS c
+LEFT JOIN INFORMATION_SCHEMA.KEY_COLUMN_USAGE k
+    ON k.TABLE_SCHEMA = c.TABLE_SCHEMA
+    AND k.TABLE_NAME = c.TABLE_NAME
+    AND k.COLUMN_NAME = c.COLUMN_NAME
+    AND k.CONSTRAINT_NAME LIKE 'PK_%'
+ORDER BY c.TABLE_SCHEMA, c.TABLE_NAME, c.COLUMN_NAME
+"""
+
+def load_all_table_metadata(conn):
+    """
+    Incremental-sync candidates for every table in one round-trip:
+    {(schema, table): {'pk': [...], 'timestamps': [...], 'uuid_or_int': [...]}},
+    each list in the order the per-table get_* queries return.
+    """
+    metadata = {}
+    pk_positions = {}
+    cursor = conn.cursor()
+    cursor.execute(TABLE_METADATA_SQL)
+    for schema, table, column, data_type, pk_position in cursor.fetchall():
+        entry = metadata.get((schema, table))
+        if entry is None:
+            entry = metadata[(schema, table)] = {'pk': [], 'timestamps': [], 'uuid_or_int': []}
+        if pk_position is not None:
+            entry['pk'].append(column)
+            pk_positions[(schema, table, column)] = pk_position
+        if data_type in ('datetime', 'datetime2', 'smalldatetime', 'timestamp'):
+            entry['timestamps'].append(column)
+        if data_type in ('uniqueidentifier', 'int', 'bigint'):
+            entry['uuid_or_int'].append(column)
+    for (schema, table), entry in metadata.items():
+        entry['pk'].sort(key=lambda column: pk_positions[(schema, table, column)])
+    return metadata
+
 def get_last_synced_pk(engine, server_name, database_name, schema, table):
     """Get last synced primary key value"""
     query = """
@@ -347,12 +368,23 @@ def get_last_synced_timestamp(engine, server_name, database_name, schema, table)
         )
         row = result.fetchone()
         return row[0] if row else None
+def load_all_last_pk(engine, server_name, database_name):
+    """Last synced key of every table in a database, in one query: {(schema, table): value}"""
+    query = """
+    SELECT schema_name, table_name, last_pk_value
+    FROM sync_table_status
+    WHERE server_name = :server_name AND database_name = :database_name
+    """
+    with engine.connect() as conn:
+        result = conn.execute(text(query), {"server_name": server_name, "database_name": database_name})
+        return {(schema, table): value for schema, table, value in result}
+
 def update_last_synced_pk(engine, server_name, database_name, schema, table, pk_value):
     """Update last synced primary key value"""
-    # Convert numpy types to Python native types for PostgreSQL compatibility
-    if hasattr(pk_value, 'item'):
-        pk_value = pk_value.item()  # Convert numpy.int64 to Python int
-    
+    update_last_synced_pks(engine, server_name, database_name, [(schema, table, pk_value)])
+
+def update_last_synced_pks(engine, server_name, database_name, updates):
+    """Upsert several (schema, table, pk_value) in one executemany"""
     query = """
     INSERT INTO sync_table_status (server_name, database_name, schema_name, table_name, last_pk_value, updated_at)
     VALUES (:server_name, :database_name, :schema, :table, :pk_value, :now)
@@ -361,18 +393,22 @@ def update_last_synced_pk(engine, server_name, database_name, schema, table, pk_
         last_pk_value = EXCLUDED.last_pk_value,
         updated_at = EXCLUDED.updated_at
     """
+    now = datetime.now()
+    params = []
+    for schema, table, pk_value in updates:
+        # Convert numpy types to Python native types for PostgreSQL compatibility
+        if hasattr(pk_value, 'item'):
+            pk_value = pk_value.item()  # Convert numpy.int64 to Python int
+        params.append({
+            "server_name": server_name,
+            "database_name": database_name,
+            "schema": schema,
+            "table": table,
+            "pk_value": str(pk_value),  # Convert to string for storage
+            "now": now
+        })
     with engine.connect() as conn:
-        conn.execute(
-            text(query),
-            {
-                "server_name": server_name,
-                "database_name": database_name,
-                "schema": schema,
-                "table": table,
-                "pk_value": str(pk_value),  # Convert to string for storage
-                "now": datetime.now()
-            }
-        )
+        conn.execute(text(query), params)
         conn.commit()
 
 def create_table_sync_tracking(engine):
@@ -409,259 +445,339 @@ def cleanup_system_tables(engine, schema_name):
         except Exception as e:
             logging.warning(f"Could not clean up {schema_name}.{table_name}: {e}")
 
-def full_sync_database(conn, db_name, server_conf, server_clean, output_dir, pg_engine):
-    """Perform full sync for a database and load into PostgreSQL"""
-    sync_start_time = datetime.now()
-    logging.info(f"Starting FULL sync for database: {db_name}")
+def write_table_csv(df, output_dir, server_clean, db_name, schema, table):
+    """Write df to <output_dir>/<server>_<db>/<schema>_<table>.csv and return the path"""
+    server_dir = os.path.join(output_dir, f"{server_clean}_{db_name}")
+    Path(server_dir).mkdir(parents=True, exist_ok=True)
+    filepath = os.path.join(server_dir, f"{schema}_{table}.csv")
+    df.to_csv(filepath, index=False)
+    return filepath
+
+def open_csv_audit(output_dir, server_clean, db_name, schema, table, columns):
+    """Open the CSV audit copy of a streamed table (keep_csv_audit); returns (file, csv writer)"""
+    server_dir = os.path.join(output_dir, f"{server_clean}_{db_name}")
+    Path(server_dir).mkdir(parents=True, exist_ok=True)
+    audit_file = open(os.path.join(server_dir, f"{schema}_{table}.csv"), "w", newline="", encoding="utf-8")
+    writer = csv.writer(audit_file)
+    writer.writerow(columns)
+    return audit_file, writer
+
+def sync_table_data(conn, engine, schema_name, query, params, output_dir, server_clean, db_name, schema, table,
+                    if_exists, track_column=None, create_if_empty=True):
+    """
+    Stream the query's rows from SQL Server into a binary COPY, fetch_batch_size
+    rows at a time, so memory stays at one batch. Returns (rows loaded, max of
+    track_column). Falls back to pandas + CSV + load_csv_to_postgres on failure.
+    """
+    batch_size = SYNC_CONFIG['fetch_batch_size']
+    max_value = None
+    audit_file = audit = None
+    source = conn.cursor()
+    try:
+        source.arraysize = batch_size
+        if params:
+            source.execute(query, params)
+        else:
+            source.execute(query)
+        names = [column[0] for column in source.description]
+        track_index = names.index(track_column) if track_column in names else None
+        if SYNC_CONFIG['keep_csv_audit']:
+            audit_file, audit = open_csv_audit(output_dir, server_clean, db_name, schema, table, names)
+        
+        def on_batch(rows):
+            # Runs on the COPY producer thread, once per fetched batch
+            nonlocal max_value
+            if audit:
+                audit.writerows(rows)
+            if track_index is None:
+                return
+            batch_max = max((row[track_index] for row in rows if row[track_index] is not None), default=None)
+            if batch_max is not None and (max_value is None or batch_max > max_value):
+                max_value = batch_max
+        
+        row_count = copy_cursor_to_postgres(
+            engine, schema_name, f"{schema}_{table}", source, batch_size, if_exists=if_exists,
+            on_batch=on_batch if audit or track_index is not None else None, create_if_empty=create_if_empty,
+            # Compliance mode never drops the synced table, it only replaces its rows
+            keep_table=SYNC_CONFIG['compliance_mode']
+        )
+        return row_count, max_value
+    except Exception as e:
+        logging.warning(f"Streaming COPY failed for {schema}.{table} ({e}), loading via CSV")
+    finally:
+        # Frees the connection for the fallback query
+        source.close()
+        if audit_file:
+            audit_file.close()
+    
+    df = pd.read_sql(query, conn, params=params or None)
+    if len(df) == 0 and not create_if_empty:
+        return 0, None
+    filepath = write_table_csv(df, output_dir, server_clean, db_name, schema, table)
+    load_csv_to_postgres(engine, schema_name, filepath, if_exists=if_exists)
+    if track_column in df.columns and len(df) > 0:
+        max_value = df[track_column].max()
+    return len(df), max_value
+
+def run_table_syncs(sync_one_table, tables, server_conf, db_name, *args):
+    """
+    Run sync_one_table(conn, schema, table, *args) for every table on a thread
+    pool of SYNC_CONFIG['table_workers']. pyodbc connections are not thread-safe,
+    so each worker opens its own; PostgreSQL goes through the engine's pool.
+    Returns the summed (processed, successful, failed, rows) results.
+    """
+    local = threading.local()
+    opened = []
+    opened_lock = threading.Lock()
+    
+    def run(schema, table):
+        conn = getattr(local, 'conn', None)
+        if conn is None:
+            conn = local.conn = get_sql_connection(server_conf, db_name)
+            with opened_lock:
+                opened.append(conn)
+        return sync_one_table(conn, schema, table, *args)
     
+    totals = (0, 0, 0, 0)
+    try:
+        with ThreadPoolExecutor(max_workers=min(SYNC_CONFIG['table_workers'], len(tables))) as executor:
+            futures = {executor.submit(run, schema, table): (schema, table) for schema, table in tables}
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    schema, table = futures[future]
+                    logging.error(f"Failed to sync {schema}.{table}: {e}")
+                    result = (0, 0, 1, 0)
+                totals = tuple(total + value for total, value in zip(totals, result))
+    finally:
+        for conn in opened:
+            conn.close()
+    return totals
+
+def list_tables(conn, table_filter=None):
+    """(schema, table) pairs to sync, after table_filter and should_skip_table"""
     cursor = conn.cursor()
     tables = []
     for row in cursor.tables(tableType='TABLE'):
+        if table_filter and table_filter not in (row.table_name, f"{row.table_schem}.{row.table_name}"):
+            continue
         tables.append((row.table_schem, row.table_name))
+    # Skip system tables and views
+    return [(schema, table) for schema, table in tables if not should_skip_table(schema, table)]
+
+def full_sync_database(conn, db_name, server_conf, server_clean, output_dir, pg_engine, table_filter=None):
+    """Perform full sync for a database and load into PostgreSQL"""
+    logging.info(f"Starting FULL sync for database: {db_name}")
     
+    tables = list_tables(conn, table_filter)
     if not tables:
         logging.warning(f"No tables found in {db_name}.")
         return 0, 0, 0, 0  # processed, successful, failed, total_rows
     
-    processed_count = 0
-    successful_syncs = 0
-    failed_syncs = 0
-    total_rows_processed = 0
-    
-    for schema, table in tables:
-        table_start_time = datetime.now()
-        try:
-            # Skip system tables and views
-            if should_skip_table(schema, table):
-                continue
-                
-            # Get source row count
-            source_count = get_table_row_count(conn, schema, table)
-            
-            query = f"SELECT * FROM [{schema}].[{table}]"
-            df = pd.read_sql(query, conn)
-            
-            server_dir = os.path.join(output_dir, f"{server_clean}_{db_name}")
-            Path(server_dir).mkdir(parents=True, exist_ok=True)
-            filename = f"{schema}_{table}.csv"
-            filepath = os.path.join(server_dir, filename)
-            df.to_csv(filepath, index=False)
-            
-            # Load into PostgreSQL
-            schema_name = f"{server_clean}_{db_name}".replace('-', '_').replace(' ', '_')
-            load_csv_to_postgres(pg_engine, schema_name, filepath, if_exists='replace')
-            
-            # Get target row count
-            target_count = get_postgres_row_count(pg_engine, schema_name, f"{schema}_{table}")
-            
-            # Calculate duration
-            table_duration = (datetime.now() - table_start_time).total_seconds()
-            
-            # Log metrics
-            monitor.log_sync_metric(
-                server_name=server_conf['server'],
-                database_name=db_name,
-                schema_name=schema,
-                table_name=table,
-                sync_type='FULL',
-                source_count=source_count,
-                target_count=target_count,
-                rows_processed=len(df),
-                rows_inserted=len(df),
-                duration=table_duration,
-                status='SUCCESS'
-            )
-            
-            # Check data consistency
-            monitor.check_data_consistency(
-                server_name=server_conf['server'],
-                database_name=db_name,
-                schema_name=schema,
-                table_name=table,
-                source_count=source_count,
-                target_count=target_count
-            )
-            
-            logging.info(f"FULL SYNC: Exported and loaded {schema}.{table} ({len(df)} rows) in {table_duration:.2f}s")
-            processed_count += 1
-            successful_syncs += 1
-            total_rows_processed += len(df)
-            
-        except Exception as e:
-            table_duration = (datetime.now() - table_start_time).total_seconds()
-            logging.error(f"Failed to export/load {schema}.{table}: {e}")
-            
-            # Log failure metrics
-            monitor.log_sync_metric(
-                server_name=server_conf['server'],
-                database_name=db_name,
-                schema_name=schema,
-                table_name=table,
-                sync_type='FULL',
-                source_count=0,
-                target_count=0,
-                rows_processed=0,
-                rows_inserted=0,
-                duration=table_duration,
-                status='FAILED',
-                error_msg=str(e)
-            )
-            
-            # Log alert
-            monitor.log_alert(
-                alert_type='SYNC_FAILURE',
-                severity='HIGH',
-                server_name=server_conf['server'],
-                database_name=db_name,
-                schema_name=schema,
-                table_name=table,
-                message=f"Full sync failed: {e}"
-            )
-            
-            failed_syncs += 1
-    
-    return processed_count, successful_syncs, failed_syncs, total_rows_processed
+    # Once up front: parallel workers racing on CREATE SCHEMA IF NOT EXISTS hit pg_namespace's unique index
+    create_schema_if_not_exists(pg_engine, f"{server_clean}_{db_name}".replace('-', '_').replace(' ', '_'))
+    return run_table_syncs(
+        full_sync_table, tables, server_conf, db_name,
+        db_name, server_conf, server_clean, output_dir, pg_engine
+    )
+
+def full_sync_table(conn, schema, table, db_name, server_conf, server_clean, output_dir, pg_engine):
+    """Full sync of one table; returns (processed, successful, failed, rows)"""
+    table_start_time = datetime.now()
+    try:
+        # Get source row count
+        source_count = get_table_row_count(conn, schema, table)
+        
+        query = f"SELECT * FROM [{schema}].[{table}]"
+        
+        # Stream into PostgreSQL
+        schema_name = f"{server_clean}_{db_name}".replace('-', '_').replace(' ', '_')
+        row_count, _ = sync_table_data(
+            conn, pg_engine, schema_name, query, None, output_dir, server_clean, db_name, schema, table,
+            if_exists='replace'
+        )
+        
+        # Get target row count
+        target_count = get_postgres_row_count(pg_engine, schema_name, f"{schema}_{table}")
+        
+        # Calculate duration
+        table_duration = (datetime.now() - table_start_time).total_seconds()
+        
+        # Log metrics
+        monitor.log_sync_metric(
+            server_name=server_conf['server'],
+            database_name=db_name,
+            schema_name=schema,
+            table_name=table,
+            sync_type='FULL',
+            source_count=source_count,
+            target_count=target_count,
+            rows_processed=row_count,
+            rows_inserted=row_count,
+            duration=table_duration,
+            status='SUCCESS'
+        )
+        
+        # Check data consistency
+        monitor.check_data_consistency(
+            server_name=server_conf['server'],
+            database_name=db_name,
+            schema_name=schema,
+            table_name=table,
+            source_count=source_count,
+            target_count=target_count
+        )
+        
+        logging.info(f"FULL SYNC: Exported and loaded {schema}.{table} ({row_count} rows) in {table_duration:.2f}s")
+        return 1, 1, 0, row_count
+        
+    except Exception as e:
+        table_duration = (datetime.now() - table_start_time).total_seconds()
+        logging.error(f"Failed to export/load {schema}.{table}: {e}")
+        
+        # Log failure metrics
+        monitor.log_sync_metric(
+            server_name=server_conf['server'],
+            database_name=db_name,
+            schema_name=schema,
+            table_name=table,
+            sync_type='FULL',
+            source_count=0,
+            target_count=0,
+            rows_processed=0,
+            rows_inserted=0,
+            duration=table_duration,
+            status='FAILED',
+            error_msg=str(e)
+        )
+        
+        # Log alert
+        monitor.log_alert(
+            alert_type='SYNC_FAILURE',
+            severity='HIGH',
+            server_name=server_conf['server'],
+            database_name=db_name,
+            schema_name=schema,
+            table_name=table,
+            message=f"Full sync failed: {e}"
+        )
+        
+        return 0, 0, 1, 0
 
-def incremental_sync_database(conn, db_name, server_conf, server_clean, output_dir, engine):
+def incremental_sync_database(conn, db_name, server_conf, server_clean, output_dir, engine, table_filter=None):
     """Perform incremental sync for a database and load into PostgreSQL"""
     logging.info(f"Starting INCREMENTAL sync for database: {db_name}")
-    cursor = conn.cursor()
-    tables = []
-    for row in cursor.tables(tableType='TABLE'):
-        tables.append((row.table_schem, row.table_name))
+    tables = list_tables(conn, table_filter)
     if not tables:
         logging.warning(f"No tables found in {db_name}.")
         return 0, 0, 0, 0  # processed, successful, failed, total_rows
-    processed_count = 0
-    successful_syncs = 0
-    failed_syncs = 0
-    total_rows_processed = 0
-    for schema, table in tables:
-        try:
-            # Skip system tables and views
-            if should_skip_table(schema, table):
-                continue
-                
-            # Get current row count for debugging
-            current_count = get_table_row_count(conn, schema, table)
-            logging.info(f"Processing {schema}.{table} (current row count: {current_count})")
-            
-            # Try to find a suitable column for incremental sync
+    # Key/timestamp/id columns of every table, fetched once instead of 3 queries per table
+    try:
+        metadata = load_all_table_metadata(conn)
+    except Exception as e:
+        logging.warning(f"Could not load column metadata for {db_name}, querying per table: {e}")
+        metadata = {}
+    last_pks = load_all_last_pk(engine, server_conf['server'], db_name)
+    # Once up front: parallel workers racing on CREATE SCHEMA IF NOT EXISTS hit pg_namespace's unique index
+    create_schema_if_not_exists(engine, f"{server_clean}_{db_name}".replace('-', '_').replace(' ', '_'))
+    return run_table_syncs(
+        incremental_sync_table, tables, server_conf, db_name,
+        db_name, server_conf, server_clean, output_dir, engine, metadata, last_pks
+    )
+
+def incremental_sync_table(conn, schema, table, db_name, server_conf, server_clean, output_dir, engine,
+                           metadata, last_pks):
+    """Incremental sync of one table; returns (processed, successful, failed, rows)"""
+    try:
+        # Current row count costs a COUNT(*) scan, so only when debugging
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(f"Processing {schema}.{table} (current row count: {get_table_row_count(conn, schema, table)})")
+        
+        # Try to find a suitable column for incremental sync
+        columns = metadata.get((schema, table))
+        if columns is not None:
+            pk_columns = columns['pk']
+            timestamp_col = columns['timestamps'][0] if columns['timestamps'] else None
+            unique_id_col = columns['uuid_or_int'][0] if columns['uuid_or_int'] else None
+        else:
             pk_columns = get_primary_key_info(conn, schema, table)
             timestamp_col = get_timestamp_column(conn, schema, table)
             unique_id_col = get_unique_identifier_column(conn, schema, table)
+        
+        # Determine which column to use for incremental sync
+        if pk_columns:
+            sync_column = pk_columns[0]
+            sync_type = "primary_key"
+            logging.info(f"Using primary key column '{sync_column}' for {schema}.{table}")
+        elif timestamp_col:
+            sync_column = timestamp_col
+            sync_type = "timestamp"
+            logging.info(f"Using timestamp column '{sync_column}' for {schema}.{table}")
+        elif unique_id_col:
+            sync_column = unique_id_col
+            sync_type = "unique_id"
+            logging.info(f"Using unique identifier column '{sync_column}' for {schema}.{table}")
+        else:
+            logging.warning(f"No suitable column found for incremental sync in {schema}.{table}, performing smart sync")
+            # Do smart sync for tables without suitable columns (compliance-friendly)
+            query = f"SELECT * FROM [{schema}].[{table}]"
             
-            # Determine which column to use for incremental sync
-            if pk_columns:
-                sync_column = pk_columns[0]
-                sync_type = "primary_key"
-                logging.info(f"Using primary key column '{sync_column}' for {schema}.{table}")
-            elif timestamp_col:
-                sync_column = timestamp_col
-                sync_type = "timestamp"
-                logging.info(f"Using timestamp column '{sync_column}' for {schema}.{table}")
-            elif unique_id_col:
-                sync_column = unique_id_col
-                sync_type = "unique_id"
-                logging.info(f"Using unique identifier column '{sync_column}' for {schema}.{table}")
-            else:
-                logging.warning(f"No suitable column found for incremental sync in {schema}.{table}, performing smart sync")
-                # Do smart sync for tables without suitable columns (compliance-friendly)
-                query = f"SELECT * FROM [{schema}].[{table}]"
-                df = pd.read_sql(query, conn)
-                
-                if len(df) > 0:
-                    server_dir = os.path.join(output_dir, f"{server_clean}_{db_name}")
-                    Path(server_dir).mkdir(parents=True, exist_ok=True)
-                    filename = f"{schema}_{table}.csv"
-                    filepath = os.path.join(server_dir, filename)
-                    df.to_csv(filepath, index=False)
-                    
-                    # Use smart sync (compliance-friendly, no replace/delete)
-                    schema_name = f"{server_clean}_{db_name}".replace('-', '_').replace(' ', '_')
-                    inserted_count = smart_sync_table_without_pk(engine, schema_name, f"{schema}_{table}", df)
-                    logging.info(f"SMART SYNC (no PK): Exported and smart-synced {inserted_count} new rows from {schema}.{table}")
-                    processed_count += 1
-                    successful_syncs += 1
-                    total_rows_processed += len(df)
-                continue
-            
-            last_pk = get_last_synced_pk(engine, server_conf['server'], db_name, schema, table)
-            
-            if last_pk is None:
-                logging.info(f"No previous sync found for {schema}.{table}, performing full sync")
-                query = f"SELECT * FROM [{schema}].[{table}]"
-                df = pd.read_sql(query, conn)
-                # For full sync within incremental, we need to get the max value to track
-                if len(df) > 0 and sync_column in df.columns:
-                    max_pk = df[sync_column].max()
-                else:
-                    max_pk = None
-            else:
-                # Check if there are actually new rows before querying
-                has_new_rows = check_for_new_rows(conn, schema, table, sync_column, last_pk)
-                if not has_new_rows:
-                    logging.info(f"No new rows found for {schema}.{table} since last sync (last_pk: {last_pk})")
-                    continue
-                
-                logging.info(f"Found new rows for {schema}.{table}, last_pk: {last_pk}")
-                query = f"SELECT * FROM [{schema}].[{table}] WHERE [{sync_column}] > ?"
-                df = pd.read_sql(query, conn, params=[last_pk])
-                max_pk = df[sync_column].max() if len(df) > 0 else last_pk
-            
-            if len(df) > 0:
-                server_dir = os.path.join(output_dir, f"{server_clean}_{db_name}")
-                Path(server_dir).mkdir(parents=True, exist_ok=True)
-                filename = f"{schema}_{table}.csv"
-                filepath = os.path.join(server_dir, filename)
-                df.to_csv(filepath, index=False)
-                
-                # Update last synced PK only if we have a valid max_pk
-                if max_pk is not None:
-                    update_last_synced_pk(engine, server_conf['server'], db_name, schema, table, max_pk)
-                
-                # Load into PostgreSQL (use replace for full sync, append for incremental)
-                schema_name = f"{server_clean}_{db_name}".replace('-', '_').replace(' ', '_')
-                if last_pk is None:
-                    # Full sync - use replace to avoid duplicates
-                    load_csv_to_postgres(engine, schema_name, filepath, if_exists='replace')
-                else:
-                    # Incremental sync - use append for new rows only
-                    load_csv_to_postgres(engine, schema_name, filepath, if_exists='append')
-                
-                # Validate row count
-                validate_row_count(engine, schema_name, f"{schema}_{table}", get_postgres_row_count(engine, schema_name, f"{schema}_{table}"))
-                logging.info(f"INCREMENTAL SYNC: Exported and loaded {len(df)} new rows from {schema}.{table}")
-                processed_count += 1
-                successful_syncs += 1
-                total_rows_processed += len(df)
-            else:
-                logging.info(f"No new data for {schema}.{table}")
-        except Exception as e:
-            logging.error(f"Failed to sync/load {schema}.{table}: {e}")
-            failed_syncs += 1
-    return processed_count, successful_syncs, failed_syncs, total_rows_processed
+            # Use smart sync (compliance-friendly, no replace/delete)
+            schema_name = f"{server_clean}_{db_name}".replace('-', '_').replace(' ', '_')
+            row_count, inserted_count = smart_sync_table_streaming(conn, engine, schema_name, f"{schema}_{table}", query)
+            if row_count == 0:
+                return 0, 0, 0, 0
+            logging.info(f"SMART SYNC (no PK): Exported and smart-synced {inserted_count} new rows from {schema}.{table}")
+            return 1, 1, 0, row_count
+        
+        last_pk = last_pks.get((schema, table))
+        
+        if last_pk is None:
+            logging.info(f"No previous sync found for {schema}.{table}, performing full sync")
+            query = f"SELECT * FROM [{schema}].[{table}]"
+            params = None
+        else:
+            # No COUNT(*) pre-check: an empty result below means nothing new
+            logging.info(f"Fetching rows of {schema}.{table} after last_pk: {last_pk}")
+            query = f"SELECT * FROM [{schema}].[{table}] WHERE [{sync_column}] > ?"
+            params = [last_pk]
+        
+        # Stream into PostgreSQL (replace for full sync to avoid duplicates, append new rows for incremental)
+        schema_name = f"{server_clean}_{db_name}".replace('-', '_').replace(' ', '_')
+        if_exists = 'replace' if last_pk is None else 'append'
+        row_count, max_pk = sync_table_data(
+            conn, engine, schema_name, query, params, output_dir, server_clean, db_name, schema, table,
+            if_exists, track_column=sync_column, create_if_empty=False
+        )
+        
+        if row_count == 0:
+            logging.info(f"No new rows found for {schema}.{table} since last sync (last_pk: {last_pk})")
+            return 0, 0, 0, 0
+        
+        # Record last synced PK only if we have a valid max_pk (once the rows are in).
+        # Stored right away: a run killed later must not append this table's rows again
+        if max_pk is not None:
+            update_last_synced_pks(engine, server_conf['server'], db_name, [(schema, table, max_pk)])
+        
+        # Validate row count
+        validate_row_count(engine, schema_name, f"{schema}_{table}", get_postgres_row_count(engine, schema_name, f"{schema}_{table}"))
+        logging.info(f"INCREMENTAL SYNC: Exported and loaded {row_count} new rows from {schema}.{table}")
+        return 1, 1, 0, row_count
+    except Exception as e:
+        logging.error(f"Failed to sync/load {schema}.{table}: {e}")
+        return 0, 0, 1, 0
 
 def get_postgres_row_count(engine, schema, table):
     with engine.connect() as conn:
         result = conn.execute(text(f'SELECT COUNT(*) FROM "{schema}"."{table}"'))
         return result.scalar()
 
-def check_for_new_rows(conn, schema, table, sync_col, last_pk):
-    """Check if there are new rows since last sync"""
-    if last_pk is None:
-        return True  # No previous sync, so we need to check
-    
-    query = f"SELECT COUNT(*) FROM [{schema}].[{table}] WHERE [{sync_col}] > ?"
-    cursor = conn.cursor()
-    cursor.execute(query, [last_pk])
-    new_count = cursor.fetchone()[0]
-    return new_count > 0
-
 def get_table_row_count(conn, schema, table):
     """Get current row count for a table"""
     try:
-        query = f"SELECT COUNT(*) FROM [{schema}].[{table}]"
+        # Identifiers can't be parameters; escape ] so names can't break out of the brackets
+        query = f"SELECT COUNT(*) FROM [{schema.replace(']', ']]')}].[{table.replace(']', ']]')}]"
         cursor = conn.cursor()
         cursor.execute(query)
         return cursor.fetchone()[0]
@@ -669,28 +785,119 @@ def get_table_row_count(conn, schema, table):
         logging.warning(f"Could not get row count for {schema}.{table}: {e}")
         return 0
 
+def insert_new_rows_in_postgres(engine, schema, table_name, source, batch_size):
+    """
+    Smart-sync comparison inside PostgreSQL: stream an executed SQL Server
+    cursor into a temp table (binary COPY) and insert the rows whose row hash
+    is not in the target yet. Neither side is loaded into a DataFrame.
+    Returns (source rows, inserted rows).
+    """
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute(
+            "SELECT column_name FROM information_schema.columns WHERE table_schema = %s AND table_name = %s",
+            (schema, table_name)
+        )
+        target_columns = {row[0] for row in cursor.fetchall()}
+        source_columns = {clean_identifier(column[0]): i for i, column in enumerate(source.description)}
+        common_columns = sorted(col for col in source_columns if col in target_columns)
+        if not common_columns:
+            raise ValueError(f"No common columns found for comparison in {schema}.{table_name}")
+        indexes = [source_columns[col] for col in common_columns]
+        
+        def batches():
+            while True:
+                rows = source.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield [tuple(row[i] for i in indexes) for row in rows]
+        
+        column_list = ', '.join(f'"{col}"' for col in common_columns)
+        source_row = ', '.join(f's."{col}"' for col in common_columns)
+        target_row = ', '.join(f't."{col}"' for col in common_columns)
+        cursor.execute(
+            f'CREATE TEMP TABLE smart_sync_source ON COMMIT DROP AS '
+            f'SELECT {column_list} FROM "{schema}"."{table_name}" WITH NO DATA'
+        )
+        row_count = copy_rows(cursor, 'pg_temp', 'smart_sync_source', common_columns, batches())
+        # Hash anti-join: one md5 per row on each side, compared on the server
+        cursor.execute(f"""
+            INSERT INTO "{schema}"."{table_name}" ({column_list})
+            SELECT {source_row} FROM pg_temp.smart_sync_source s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM "{schema}"."{table_name}" t
+                WHERE md5(ROW({target_row})::text) = md5(ROW({source_row})::text)
+            )
+        """)
+        inserted = cursor.rowcount
+        raw.commit()
+        return row_count, inserted
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+
+def smart_sync_table_streaming(conn, engine, schema, table_name, query):
+    """
+    Smart sync straight from SQL Server rows (no DataFrame). Returns
+    (source rows, inserted rows); falls back to the pandas smart sync on failure.
+    """
+    batch_size = SYNC_CONFIG['fetch_batch_size']
+    source = conn.cursor()
+    try:
+        source.arraysize = batch_size
+        source.execute(query)
+        with engine.connect() as pg_conn:
+            table_exists = pg_conn.execute(
+                text("SELECT to_regclass(:name)"), {"name": f'"{schema}"."{table_name}"'}
+            ).scalar() is not None
+        if not table_exists:
+            row_count = copy_cursor_to_postgres(engine, schema, table_name, source, batch_size, create_if_empty=False)
+            if row_count:
+                logging.info(f"Smart sync: Created table and inserted {row_count} rows into {schema}.{table_name}")
+            return row_count, row_count
+        row_count, inserted = insert_new_rows_in_postgres(engine, schema, table_name, source, batch_size)
+        if inserted:
+            logging.info(f"Smart sync: Inserted {inserted} new rows into {schema}.{table_name}")
+        else:
+            logging.info(f"Smart sync: No new rows found for {schema}.{table_name}")
+        return row_count, inserted
+    except Exception as e:
+        logging.warning(f"Streaming smart sync failed for {schema}.{table_name} ({e}), comparing in pandas")
+    finally:
+        # Frees the connection for the fallback query
+        source.close()
+    
+    df = pd.read_sql(query, conn)
+    if len(df) == 0:
+        return 0, 0
+    return len(df), smart_sync_table_without_pk(engine, schema, table_name, df)
+
 def smart_sync_table_without_pk(engine, schema, table_name, source_df):
     """Smart sync for tables without primary keys - compares rows to avoid duplicates"""
     try:
         # Check if table exists in PostgreSQL
         with engine.connect() as conn:
-            try:
-                existing_df = pd.read_sql(f'SELECT * FROM "{schema}"."{table_name}"', conn)
-                table_exists = True
-            except:
-                table_exists = False
+            table_exists = conn.execute(
+                text("SELECT to_regclass(:name)"), {"name": f'"{schema}"."{table_name}"'}
+            ).scalar() is not None
         
         if not table_exists:
             # Table doesn't exist, create it and insert all data
             create_schema_if_not_exists(engine, schema)
             create_table_with_proper_types(engine, schema, table_name, source_df)
-            source_df.to_sql(table_name, engine, schema=schema, if_exists='append', index=False)
+            copy_df(engine, schema, table_name, source_df)
             logging.info(f"Smart sync: Created table and inserted {len(source_df)} rows into {schema}.{table_name}")
             return len(source_df)
         
+        with engine.connect() as conn:
+            existing_df = pd.read_sql(f'SELECT * FROM "{schema}"."{table_name}"', conn)
+        
         if len(existing_df) == 0:
             # No existing data, just insert all
-            source_df.to_sql(table_name, engine, schema=schema, if_exists='append', index=False)
+            copy_df(engine, schema, table_name, source_df)
             logging.info(f"Smart sync: Inserted {len(source_df)} new rows into {schema}.{table_name}")
             return len(source_df)
         
@@ -699,27 +906,29 @@ def smart_sync_table_without_pk(engine, schema, table_name, source_df):
         source_columns = [col for col in source_df.columns if col != 'row_hash']
         existing_columns = [col for col in existing_df.columns if col != 'row_hash']
         
-        # Ensure both dataframes have the same columns for comparison
-        common_columns = list(set(source_columns) & set(existing_columns))
+        # Ensure both dataframes have the same columns for comparison (same order every run)
+        common_columns = sorted(set(source_columns) & set(existing_columns))
         
         if not common_columns:
             logging.warning(f"No common columns found for comparison in {schema}.{table_name}")
             return 0
         
         source_df_clean = source_df[common_columns].fillna('')
-        existing_df_clean = existing_df[common_columns].fillna('')
+        # Hashes depend on dtype, so read the target's columns back as the source's types
+        existing_df_clean = existing_df[common_columns].fillna('').astype(source_df_clean.dtypes.to_dict(), errors='ignore')
         
-        # Create hash of each row for comparison
-        source_df_clean['row_hash'] = source_df_clean.apply(lambda x: hash(tuple(x)), axis=1)
-        existing_df_clean['row_hash'] = existing_df_clean.apply(lambda x: hash(tuple(x)), axis=1)
+        # Hash each row column-wise in C (uint64 per row)
+        source_hashes = pd.util.hash_pandas_object(source_df_clean, index=False).to_numpy()
+        existing_hashes = pd.util.hash_pandas_object(existing_df_clean, index=False).to_numpy()
         
         # Find new rows (rows in source but not in existing)
-        new_rows = source_df_clean[~source_df_clean['row_hash'].isin(existing_df_clean['row_hash'])]
+        new_mask = ~pd.Index(source_hashes).isin(existing_hashes)
+        new_rows = source_df_clean[new_mask]
         
         if len(new_rows) > 0:
-            # Remove the hash column and get the original data for insertion
-            new_rows_original = source_df.iloc[new_rows.index]
-            new_rows_original.to_sql(table_name, engine, schema=schema, if_exists='append', index=False)
+            # Get the original data for insertion
+            new_rows_original = source_df[new_mask]
+            copy_df(engine, schema, table_name, new_rows_original)
             logging.info(f"Smart sync: Inserted {len(new_rows)} new rows into {schema}.{table_name}")
             return len(new_rows)
         else:
@@ -732,8 +941,8 @@ def smart_sync_table_without_pk(engine, schema, table_name, source_df):
         source_df.to_sql(table_name, engine, schema=schema, if_exists='append', index=False)
         return len(source_df)
 
-def process_sql_server_hybrid(server_name, server_conf, run_id):
-    """Process a single SQL Server with hybrid sync"""
+def process_sql_server_hybrid(server_name, server_conf, run_id, database=None, table=None):
+    """Process a single SQL Server with hybrid sync (optionally one database / table)"""
     session_start_time = datetime.now()
     session_id = f"{server_name}_{session_start_time.strftime('%Y%m%d_%H%M%S')}"
 
@@ -748,6 +957,8 @@ def process_sql_server_hybrid(server_name, server_conf, run_id):
 
         databases = get_all_databases(master_conn)
         master_conn.close()
+        if database:
+            databases = [db for db in databases if db == database]
 
         if not databases:
             logging.warning(f"No user databases found on {server_conf['server']}.")
@@ -767,8 +978,11 @@ def process_sql_server_hybrid(server_name, server_conf, run_id):
         full_sync_count = 0
         incremental_sync_count = 0
 
+        # Only databases explicitly listed in skip_databases are skipped
+        skip_dbs = frozenset(server_conf.get('skip_databases') or ())
         for db_name in databases:
-            if should_skip_database(db_name, server_conf):
+            if db_name in skip_dbs:
+                logging.info(f"Skipping database: {db_name} (listed in skip_databases)")
                 skipped_tables += 1
                 continue
 
@@ -782,7 +996,8 @@ def process_sql_server_hybrid(server_name, server_conf, run_id):
                 logging.info(f"New database discovered: {db_name}")
                 db_conn = get_sql_connection(server_conf, db_name)
                 processed, success, failed, rows = full_sync_database(
-                    db_conn, db_name, server_conf, server_clean, OUTPUT_DIR, pg_engine
+                    db_conn, db_name, server_conf, server_clean, OUTPUT_DIR, pg_engine,
+                    table_filter=table
                 )
                 db_conn.close()
 
@@ -798,7 +1013,8 @@ def process_sql_server_hybrid(server_name, server_conf, run_id):
                 logging.info(f"Existing database: {db_name}")
                 db_conn = get_sql_connection(server_conf, db_name)
                 processed, success, failed, rows = incremental_sync_database(
-                    db_conn, db_name, server_conf, server_clean, OUTPUT_DIR, pg_engine
+                    db_conn, db_name, server_conf, server_clean, OUTPUT_DIR, pg_engine,
+                    table_filter=table
                 )
                 db_conn.close()
 
@@ -920,8 +1136,9 @@ def debug_find_new_rows(server_name, server_conf):
         
         logging.info(f"=== DEBUG: Checking for recent changes in {server_name} ===")
         
+        skip_dbs = frozenset(server_conf.get('skip_databases') or ())
         for db_name in databases:
-            if should_skip_database(db_name, server_conf):
+            if db_name in skip_dbs:
                 continue
                 
             db_conn = get_sql_connection(server_conf, db_name)
@@ -943,13 +1160,20 @@ def debug_find_new_rows(server_name, server_conf):
     except Exception as e:
         logging.error(f"Debug error for {server_name}: {e}")
 
-def main():
-    """Process all SQL servers with hybrid sync"""
+def main(server=None, database=None, table=None):
+    """Process all SQL servers with hybrid sync, or just the given server/database/table"""
+    global config, pg_conf
+    # Pick up servers added through the UI since the module was imported
+    config = load_config()
+    pg_conf = config['postgresql']
+
     # Start comprehensive logging
     run_id = comprehensive_logger.start_migration_run('HYBRID_SYNC')
     comprehensive_logger.log_system_health(run_id)
     
     sqlservers = config.get('sqlservers', {})
+    if server:
+        sqlservers = {name: conf for name, conf in sqlservers.items() if name == server}
     
     if not sqlservers:
         logging.error("No SQL servers configured in db_connections.yaml")
@@ -975,7 +1199,7 @@ def main():
             comprehensive_logger.log_server_event(run_id, server_name, 'ALL', 'INFO', f"Processing SQL Server: {server_name}")
             
             # Process the server and get summary
-            summary = process_sql_server_hybrid(server_name, server_conf, run_id)
+            summary = process_sql_server_hybrid(server_name, server_conf, run_id, database, table) or {}
             
             # Aggregate
             total_databases += summary.get("databases", 0)
@@ -1007,4 +1231,9 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # app.py falls back to running this script with the target passed through the environment
+    main(
+        server=os.environ.get("SELECTED_SERVER") or None,
+        database=os.environ.get("DB_NAME") or None,
+        table=os.environ.get("TABLE_NAME") or None,
+    )
\ No newline at end of file
@@ -1,5 +1,5 @@
 import os
-import yaml
+from config_cache import get_config
 import pandas as pd
 import logging
 from sqlalchemy import create_engine, text, MetaData, inspect
@@ -18,8 +18,7 @@ logging.basicConfig(
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), '../config/db_connections.yaml')
 EXPORT_DIR = os.path.join(os.path.dirname(__file__), '../data/sqlserver_exports/')
 
-with open(CONFIG_PATH, 'r') as f:
-    config = yaml.safe_load(f)
+config = get_config(CONFIG_PATH)
 
 pg_conf = config['postgresql']
 
@@ -110,11 +109,13 @@ def create_table_with_proper_types(engine, schema, table_name, df):
         logging.info(f"Created table '{schema}.{table_name}' with proper data types")
 
 def load_csv_to_postgres(engine, schema, csv_path):
-    table_name = os.path.splitext(os.path.basename(csv_path))[0]
+    table_name = os.path.basename(csv_path)
+    table_name = table_name[:-len('.gz')] if table_name.endswith('.gz') else table_name
+    table_name = os.path.splitext(table_name)[0]
     # Clean table name (remove special characters)
     table_name = ''.join(c for c in table_name if c.isalnum() or c in '_-')
     
-    # Read CSV
+    # Read CSV (gzip is detected from the .gz extension)
     df = pd.read_csv(csv_path)
     
     # Create table with proper data types
@@ -126,7 +127,7 @@ def load_csv_to_postgres(engine, schema, csv_path):
 
 def process_server_directory(engine, server_dir, schema_name):
     """Process all CSV files in a server directory"""
-    csv_files = [f for f in os.listdir(server_dir) if f.endswith('.csv')]
+    csv_files = [f for f in os.listdir(server_dir) if f.endswith(('.csv', '.csv.gz'))]
     
     if not csv_files:
         logging.warning(f"No CSV files found in {server_dir}")
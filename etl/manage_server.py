@@ -1,9 +1,12 @@
 import os
+import json
 import yaml
-import pyodbc
 import logging
-from flask import Blueprint, render_template, request, jsonify
+from datetime import datetime
+from flask import Blueprint, Response, render_template, request, jsonify
 from auth import login_required
+from cache import cache
+from config_cache import get_config, invalidate as invalidate_config
 
 # ---------------- Blueprint ----------------
 manage_server_bp = Blueprint("manage_server", __name__, template_folder="templates")
@@ -16,27 +19,31 @@ CONFIG_PATH = os.environ.get("DB_CONFIG_PATH") or os.path.join(os.path.dirname(_
 if not os.path.exists(CONFIG_PATH):
     raise FileNotFoundError(f"Config file not found at {CONFIG_PATH}")
 
+# (mtime, size, servers JSON bytes) for /api/sqlservers/list
+_servers_json_cache = None
+
 # ---------------- Helper Functions ----------------
 def load_config():
-    """Load YAML config."""
-    with open(CONFIG_PATH, "r") as f:
-        return yaml.safe_load(f) or {}
+    """Load YAML config (parsed once per file change, see config_cache)."""
+    return get_config(CONFIG_PATH)
 
 def save_config(config):
     """Save YAML config."""
+    global _servers_json_cache
     with open(CONFIG_PATH, "w") as f:
         yaml.safe_dump(config, f, default_flow_style=False)
+    invalidate_config()
+    _servers_json_cache = None
+    # Cached pages list the configured servers
+    cache.clear()
     logging.info("Config saved successfully.")
 
 def test_sql_connection(server, username, password, timeout=5):
     """Test SQL Server connection and return list of databases."""
+    from connections import build_conn_str, connect  # loads the ODBC driver manager; only needed when adding a server
     try:
-        conn_str = (
-            "DRIVER={ODBC Driver 18 for SQL Server};"
-            f"SERVER={server};UID={username};PWD={password};"
-            "TrustServerCertificate=yes;Encrypt=no;"
-        )
-        with pyodbc.connect(conn_str, timeout=timeout) as conn:
+        conn_str = build_conn_str({"server": server, "username": username, "password": password})
+        with connect(conn_str, timeout=timeout) as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT name 
@@ -64,9 +71,18 @@ def manage_servers_page():
 @manage_server_bp.route("/api/sqlservers/list")
 @login_required(roles=["admin","operator"])
 def api_sqlservers_list():
-    """Return JSON of all SQL servers."""
-    config = load_config()
-    return jsonify(config.get("sqlservers", {}))
+    """Return JSON of all SQL servers (serialized once per config change)."""
+    global _servers_json_cache
+    st = os.stat(CONFIG_PATH)
+    cached = _servers_json_cache
+    if cached is None or cached[0] != st.st_mtime or cached[1] != st.st_size:
+        config = load_config()
+        cached = (st.st_mtime, st.st_size, json.dumps(config.get("sqlservers", {})).encode())
+        _servers_json_cache = cached
+    resp = Response(cached[2], mimetype="application/json")
+    resp.set_etag(f"{int(cached[0] * 1000)}-{cached[1]}")
+    resp.last_modified = datetime.fromtimestamp(cached[0])
+    return resp.make_conditional(request)
 
 @manage_server_bp.route("/api/sqlservers/add", methods=["POST"])
 @login_required(roles=["admin"])
@@ -1,7 +1,8 @@
 import os
-import yaml
+from config_cache import get_config
 import pandas as pd
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from sqlalchemy import create_engine, text, MetaData, inspect
 from pathlib import Path
@@ -13,17 +14,22 @@ from email.mime.multipart import MIMEMultipart
 
 # Load configuration
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), '../config/db_connections.yaml')
-with open(CONFIG_PATH, 'r') as f:
-    config = yaml.safe_load(f)
+config = get_config(CONFIG_PATH)
 
 pg_conf = config['postgresql']
 
+# Runs the dashboard's independent queries side by side (one per section)
+_dashboard_pool = ThreadPoolExecutor(max_workers=5, thread_name_prefix="dashboard-query")
+
 class MigrationMonitor:
     """Comprehensive monitoring system for SQL Server to PostgreSQL migration"""
     
     def __init__(self):
         self.engine = create_engine(
-            f"postgresql+psycopg2://{pg_conf['username']}:{pg_conf['password']}@{pg_conf['host']}:{pg_conf['port']}/{pg_conf['database']}"
+            f"postgresql+psycopg2://{pg_conf['username']}:{pg_conf['password']}@{pg_conf['host']}:{pg_conf['port']}/{pg_conf['database']}",
+            executemany_mode="values_plus_batch",
+            insertmanyvalues_page_size=500,
+            executemany_batch_page_size=500
         )
         self.setup_monitoring_tables()
         
@@ -123,11 +129,10 @@ class MigrationMonitor:
             """
         }
         
-        with self.engine.connect() as conn:
-            for table_name, create_sql in tables.items():
-                conn.execute(text(create_sql))
-                conn.commit()
-                logging.info(f"Monitoring table {table_name} created/verified")
+        # Every CREATE in one round-trip and one transaction, reported with one log line
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(";\n".join(tables.values()))
+        logging.info(f"Verified {len(tables)} monitoring tables")
     
     def log_sync_metric(self, server_name: str, database_name: str, schema_name: str, 
                        table_name: str, sync_type: str, source_count: int, target_count: int,
@@ -266,7 +271,9 @@ class MigrationMonitor:
     
     def get_dashboard_data(self) -> Dict:
         """Get comprehensive dashboard data"""
-        dashboard_data = {}
+        isoformat = datetime.isoformat  # bound once for the row loops below
+        # Every section is LIMITed or bounded by date, so rows are consumed straight off
+        # the cursor into the dicts (no intermediate list, no server-side cursor needed)
         
         # Overall metrics
         overall_query = """
@@ -283,21 +290,6 @@ class MigrationMonitor:
         WHERE sync_timestamp >= CURRENT_DATE - INTERVAL '7 days'
         """
         
-        with self.engine.connect() as conn:
-            result = conn.execute(text(overall_query))
-            row = result.fetchone()
-            if row:
-                dashboard_data['overall'] = {
-                    'total_servers': row[0] or 0,
-                    'total_databases': row[1] or 0,
-                    'total_tables': row[2] or 0,
-                    'total_rows_migrated': row[3] or 0,
-                    'successful_syncs': row[4] or 0,
-                    'failed_syncs': row[5] or 0,
-                    'avg_sync_duration': float(row[6] or 0),
-                    'avg_consistency_score': float(row[7] or 0)
-                }
-        
         # Recent syncs
         recent_syncs_query = """
         SELECT server_name, database_name, table_name, sync_type, sync_status, 
@@ -307,21 +299,6 @@ class MigrationMonitor:
         LIMIT 20
         """
         
-        with self.engine.connect() as conn:
-            result = conn.execute(text(recent_syncs_query))
-            dashboard_data['recent_syncs'] = [
-                {
-                    'server_name': row[0],
-                    'database_name': row[1],
-                    'table_name': row[2],
-                    'sync_type': row[3],
-                    'sync_status': row[4],
-                    'sync_timestamp': row[5].isoformat() if row[5] else None,
-                    'consistency_percentage': float(row[6] or 0)
-                }
-                for row in result.fetchall()
-            ]
-        
         # Data consistency issues
         consistency_query = """
         SELECT server_name, database_name, schema_name, table_name, 
@@ -332,22 +309,6 @@ class MigrationMonitor:
         LIMIT 10
         """
         
-        with self.engine.connect() as conn:
-            result = conn.execute(text(consistency_query))
-            dashboard_data['consistency_issues'] = [
-                {
-                    'server_name': row[0],
-                    'database_name': row[1],
-                    'schema_name': row[2],
-                    'table_name': row[3],
-                    'source_count': row[4],
-                    'target_count': row[5],
-                    'missing_rows': row[6],
-                    'consistency_percentage': float(row[7] or 0)
-                }
-                for row in result.fetchall()
-            ]
-        
         # Active alerts
         alerts_query = """
         SELECT alert_type, severity, server_name, database_name, table_name, message, alert_timestamp
@@ -357,21 +318,6 @@ class MigrationMonitor:
         LIMIT 10
         """
         
-        with self.engine.connect() as conn:
-            result = conn.execute(text(alerts_query))
-            dashboard_data['active_alerts'] = [
-                {
-                    'alert_type': row[0],
-                    'severity': row[1],
-                    'server_name': row[2],
-                    'database_name': row[3],
-                    'table_name': row[4],
-                    'message': row[5],
-                    'alert_timestamp': row[6].isoformat() if row[6] else None
-                }
-                for row in result.fetchall()
-            ]
-        
         # Sync performance trends
         performance_query = """
         SELECT DATE(sync_timestamp) as sync_date,
@@ -384,18 +330,91 @@ class MigrationMonitor:
         ORDER BY sync_date DESC
         """
         
-        with self.engine.connect() as conn:
-            result = conn.execute(text(performance_query))
-            dashboard_data['performance_trends'] = [
+        def overall(conn):
+            row = conn.execute(text(overall_query)).mappings().first()
+            if not row:
+                return None
+            return {
+                'total_servers': row['total_servers'] or 0,
+                'total_databases': row['total_databases'] or 0,
+                'total_tables': row['total_tables'] or 0,
+                'total_rows_migrated': row['total_rows_migrated'] or 0,
+                'successful_syncs': row['successful_syncs'] or 0,
+                'failed_syncs': row['failed_syncs'] or 0,
+                'avg_sync_duration': float(row['avg_sync_duration'] or 0),
+                'avg_consistency_score': float(row['avg_consistency_score'] or 0)
+            }
+        
+        def recent_syncs(conn):
+            return [
+                {
+                    'server_name': row['server_name'],
+                    'database_name': row['database_name'],
+                    'table_name': row['table_name'],
+                    'sync_type': row['sync_type'],
+                    'sync_status': row['sync_status'],
+                    'sync_timestamp': isoformat(row['sync_timestamp']) if row['sync_timestamp'] else None,
+                    'consistency_percentage': float(row['data_consistency_percentage'] or 0)
+                }
+                for row in conn.execute(text(recent_syncs_query)).mappings()
+            ]
+        
+        def consistency_issues(conn):
+            return [
                 {
-                    'date': row[0].isoformat() if row[0] else None,
-                    'total_syncs': row[1],
-                    'avg_duration': float(row[2] or 0),
-                    'avg_consistency': float(row[3] or 0)
+                    'server_name': row['server_name'],
+                    'database_name': row['database_name'],
+                    'schema_name': row['schema_name'],
+                    'table_name': row['table_name'],
+                    'source_count': row['source_row_count'],
+                    'target_count': row['target_row_count'],
+                    'missing_rows': row['missing_rows'],
+                    'consistency_percentage': float(row['consistency_percentage'] or 0)
                 }
-                for row in result.fetchall()
+                for row in conn.execute(text(consistency_query)).mappings()
             ]
         
+        def active_alerts(conn):
+            return [
+                {
+                    'alert_type': row['alert_type'],
+                    'severity': row['severity'],
+                    'server_name': row['server_name'],
+                    'database_name': row['database_name'],
+                    'table_name': row['table_name'],
+                    'message': row['message'],
+                    'alert_timestamp': isoformat(row['alert_timestamp']) if row['alert_timestamp'] else None
+                }
+                for row in conn.execute(text(alerts_query)).mappings()
+            ]
+        
+        def performance_trends(conn):
+            return [
+                {
+                    'date': row['sync_date'].isoformat() if row['sync_date'] else None,
+                    'total_syncs': row['total_syncs'],
+                    'avg_duration': float(row['avg_duration'] or 0),
+                    'avg_consistency': float(row['avg_consistency'] or 0)
+                }
+                for row in conn.execute(text(performance_query)).mappings()
+            ]
+        
+        def run(section):
+            # Each section on its own pooled connection
+            with self.engine.connect() as conn:
+                return section(conn)
+        
+        # The five queries are independent: latency is the slowest one, not the sum
+        sections = [overall, recent_syncs, consistency_issues, active_alerts, performance_trends]
+        futures = {section.__name__: _dashboard_pool.submit(run, section) for section in sections}
+        
+        dashboard_data = {}
+        for name, future in futures.items():
+            result = future.result()
+            if name == 'overall' and result is None:
+                continue
+            dashboard_data[name] = result
+        
         return dashboard_data
     
     def generate_dashboard_report(self) -> str:
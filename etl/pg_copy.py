@@ -0,0 +1,161 @@
+"""COPY ... FROM STDIN (FORMAT BINARY) for loading row tuples into PostgreSQL."""
+import os
+import uuid
+import threading
+import struct
+import datetime
+
+PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)   # signature, flags, extension length
+PGCOPY_TRAILER = struct.pack(">h", -1)
+COPY_CHUNK_BYTES = 1 << 20
+_NULL = struct.pack(">i", -1)
+_PG_EPOCH = datetime.datetime(2000, 1, 1)
+_PG_EPOCH_UTC = _PG_EPOCH.replace(tzinfo=datetime.timezone.utc)
+_PG_EPOCH_DATE = _PG_EPOCH.date()
+
+# ---------------- Field Encoders ----------------
+# Each returns the length-prefixed binary form of one non-NULL value.
+def _enc_int2(v):
+    return struct.pack(">ih", 2, int(v))
+
+def _enc_int4(v):
+    return struct.pack(">ii", 4, int(v))
+
+def _enc_int8(v):
+    return struct.pack(">iq", 8, int(v))
+
+def _enc_float4(v):
+    return struct.pack(">if", 4, float(v))
+
+def _enc_float8(v):
+    return struct.pack(">id", 8, float(v))
+
+def _enc_bool(v):
+    return struct.pack(">i?", 1, bool(v))
+
+def _enc_text(v):
+    data = str(v).encode("utf-8")
+    return struct.pack(">i", len(data)) + data
+
+def _enc_bytea(v):
+    data = bytes(v)
+    return struct.pack(">i", len(data)) + data
+
+def _enc_uuid(v):
+    return struct.pack(">i", 16) + (v if isinstance(v, uuid.UUID) else uuid.UUID(str(v))).bytes
+
+def _micros(delta):
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+def _enc_timestamp(v):
+    # Microseconds since 2000-01-01; aware values are stored as their UTC wall time
+    if v.tzinfo is not None:
+        return struct.pack(">iq", 8, _micros(v - _PG_EPOCH_UTC))
+    return struct.pack(">iq", 8, _micros(v - _PG_EPOCH))
+
+def _enc_timestamptz(v):
+    if v.tzinfo is None:
+        v = v.replace(tzinfo=datetime.timezone.utc)
+    return struct.pack(">iq", 8, _micros(v - _PG_EPOCH_UTC))
+
+def _enc_date(v):
+    if isinstance(v, datetime.datetime):
+        v = v.date()
+    return struct.pack(">ii", 4, (v - _PG_EPOCH_DATE).days)
+
+def _enc_time(v):
+    return struct.pack(">iq", 8, ((v.hour * 60 + v.minute) * 60 + v.second) * 1000000 + v.microsecond)
+
+# pg_type.typname -> encoder
+ENCODERS = {
+    "int2": _enc_int2,
+    "int4": _enc_int4,
+    "int8": _enc_int8,
+    "float4": _enc_float4,
+    "float8": _enc_float8,
+    "bool": _enc_bool,
+    "text": _enc_text,
+    "varchar": _enc_text,
+    "bpchar": _enc_text,
+    "bytea": _enc_bytea,
+    "uuid": _enc_uuid,
+    "timestamp": _enc_timestamp,
+    "timestamptz": _enc_timestamptz,
+    "date": _enc_date,
+    "time": _enc_time,
+}
+
+COLUMN_TYPES_SQL = """
+SELECT a.attname, t.typname
+FROM pg_attribute a
+JOIN pg_type t ON t.oid = a.atttypid
+WHERE a.attrelid = %s::regclass AND a.attnum > 0 AND NOT a.attisdropped
+"""
+
+def column_encoders(cursor, schema, table, columns):
+    """Encoders for `columns` of schema.table, chosen from the table's actual column types."""
+    cursor.execute(COLUMN_TYPES_SQL, (f'"{schema}"."{table}"',))
+    types = dict(cursor.fetchall())
+    encoders = []
+    for column in columns:
+        if column not in types:
+            raise ValueError(f'Column "{column}" does not exist in {schema}.{table}')
+        if types[column] not in ENCODERS:
+            raise ValueError(f"No binary encoder for {schema}.{table}.{column} ({types[column]})")
+        encoders.append(ENCODERS[types[column]])
+    return encoders
+
+def encode_rows(rows, encoders):
+    """One COPY BINARY tuple per row; None and NaN/NaT become NULL."""
+    buf = bytearray()
+    field_count = struct.pack(">h", len(encoders))
+    for row in rows:
+        buf += field_count
+        for encode, value in zip(encoders, row):
+            buf += _NULL if value is None or value != value else encode(value)
+    return buf
+
+def copy_rows(cursor, schema, table, columns, batches):
+    """
+    COPY batches (iterables of row tuples, values in `columns` order) into
+    schema.table in binary format. A producer thread pulls and encodes the
+    batches into an os.pipe() while copy_expert streams the other end to the
+    server, so fetching and loading overlap. Runs in the cursor's transaction;
+    returns the number of rows sent.
+    """
+    encoders = column_encoders(cursor, schema, table, columns)
+    row_count = 0
+    error = None
+    read_fd, write_fd = os.pipe()
+
+    def produce():
+        nonlocal row_count, error
+        try:
+            with os.fdopen(write_fd, "wb", buffering=COPY_CHUNK_BYTES) as pipe:
+                pipe.write(PGCOPY_HEADER)
+                for rows in batches:
+                    rows = list(rows)
+                    row_count += len(rows)
+                    pipe.write(encode_rows(rows, encoders))
+                pipe.write(PGCOPY_TRAILER)
+        except BaseException as e:
+            # Closing the write end ends the COPY; the error is raised after the join
+            error = e
+
+    producer = threading.Thread(target=produce, name=f"copy-{table}", daemon=True)
+    producer.start()
+    column_list = ", ".join(f'"{c}"' for c in columns)
+    try:
+        # A failed COPY closes the read end, which stops the producer with BrokenPipeError
+        with os.fdopen(read_fd, "rb") as pipe:
+            cursor.copy_expert(
+                f'COPY "{schema}"."{table}" ({column_list}) FROM STDIN WITH (FORMAT BINARY)',
+                pipe,
+                size=COPY_CHUNK_BYTES,
+            )
+    finally:
+        producer.join()
+        # The server accepts a stream cut short, so a failed producer must fail the load
+        if error is not None and not isinstance(error, BrokenPipeError):
+            raise error
+    return row_count
@@ -1,8 +1,13 @@
+import io
 import os
+import uuid
+import decimal
+import datetime
 import pandas as pd
 import logging
 from sqlalchemy import text
 from pathlib import Path
+from pg_copy import copy_rows
 
 def create_schema_if_not_exists(engine, schema):
     with engine.connect() as conn:
@@ -26,10 +31,35 @@ def infer_data_type(series):
                 return 'UUID'
         return 'TEXT'
 
+# cursor.description type -> PostgreSQL type (what read_sql + infer_data_type gave for it)
+_DESCRIPTION_TYPES = {
+    int: 'BIGINT',
+    float: 'DOUBLE PRECISION',
+    decimal.Decimal: 'DOUBLE PRECISION',
+    bool: 'BOOLEAN',
+    datetime.datetime: 'TIMESTAMP',
+}
+
+def infer_column_types(description, sample_rows):
+    """PostgreSQL types for a cursor's columns; text columns are checked for UUIDs in sample_rows"""
+    pg_types = []
+    for i, column in enumerate(description):
+        pg_type = _DESCRIPTION_TYPES.get(column[1])
+        if pg_type is None:
+            sample = [row[i] for row in sample_rows if row[i] is not None][:10]
+            if sample and all(len(str(val)) == 36 and str(val).count('-') == 4 for val in sample):
+                pg_type = 'UUID'
+            else:
+                pg_type = 'TEXT'
+        pg_types.append(pg_type)
+    return pg_types
+
 def create_table_with_proper_types(engine, schema, table_name, df):
+    create_table_with_columns(engine, schema, table_name, list(df.columns), [infer_data_type(series) for _, series in df.items()])
+
+def create_table_with_columns(engine, schema, table_name, col_names, pg_types):
     columns = []
-    for col_name, series in df.items():
-        pg_type = infer_data_type(series)
+    for col_name, pg_type in zip(col_names, pg_types):
         clean_col_name = ''.join(c for c in col_name if c.isalnum() or c in '_-')
         columns.append(f'"{clean_col_name}" {pg_type}')
     columns_def = ', '.join(columns)
@@ -52,6 +82,114 @@ def load_csv_to_postgres(engine, schema, csv_path, if_exists='append'):
     df.to_sql(table_name, engine, schema=schema, if_exists=if_exists, index=False)
     logging.info(f"Loaded {csv_path} into {schema}.{table_name} ({len(df)} rows)")
 
+def clean_identifier(name):
+    return ''.join(c for c in name if c.isalnum() or c in '_-')
+
+def copy_df(engine, schema, table_name, df):
+    """Append df with COPY ... FROM STDIN (CSV from memory) instead of to_sql's INSERTs"""
+    buf = io.StringIO()
+    df.to_csv(buf, index=False, header=False, na_rep='\\N')
+    buf.seek(0)
+    columns = ', '.join(f'"{clean_identifier(c)}"' for c in df.columns)
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.copy_expert(f'''COPY "{schema}"."{table_name}" ({columns}) FROM STDIN WITH (FORMAT CSV, NULL '\\N')''', buf)
+        raw.commit()
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+    return len(df)
+
+# Views, rules or foreign keys on the table: DROP TABLE would fail (or take them along)
+HAS_DEPENDENTS_SQL = """
+SELECT EXISTS (
+    SELECT 1 FROM pg_depend d JOIN pg_rewrite r ON r.oid = d.objid
+    WHERE d.classid = 'pg_rewrite'::regclass AND d.refobjid = %(rel)s::regclass AND r.ev_class <> d.refobjid
+) OR EXISTS (
+    SELECT 1 FROM pg_constraint WHERE confrelid = %(rel)s::regclass AND conrelid <> confrelid
+)
+"""
+
+# GRANTs and the table comment, as statements to replay on the swapped-in table
+# (LIKE ... INCLUDING ALL already copies column comments)
+TABLE_ACL_SQL = """
+SELECT format('GRANT %%s ON %%s TO %%s%%s', a.privilege_type, %(new)s,
+              CASE WHEN a.grantee = 0 THEN 'PUBLIC' ELSE quote_ident(pg_get_userbyid(a.grantee)) END,
+              CASE WHEN a.is_grantable THEN ' WITH GRANT OPTION' ELSE '' END)
+FROM pg_class c, aclexplode(c.relacl) a
+WHERE c.oid = %(rel)s::regclass
+UNION ALL
+SELECT format('COMMENT ON TABLE %%s IS %%L', %(new)s, obj_description(%(rel)s::regclass, 'pg_class'))
+WHERE obj_description(%(rel)s::regclass, 'pg_class') IS NOT NULL
+"""
+
+def copy_cursor_to_postgres(engine, schema, table_name, source, batch_size, if_exists='append',
+                            on_batch=None, create_if_empty=True, keep_table=False):
+    """
+    Stream an executed DB-API cursor's result into schema.table with a binary
+    COPY, batch_size rows at a time (no DataFrame, no CSV). The table is created
+    from the cursor's column types if missing. 'replace' loads an UNLOGGED
+    staging copy, then either replaces the rows in place (DELETE + INSERT ...
+    SELECT; with keep_table=True or when views/foreign keys depend on the
+    table) or swaps the copy in. The swap's SET LOGGED still writes the whole
+    table to WAL once, but leaves no dead tuples behind; grants and the table
+    comment are carried over. on_batch(rows) sees every batch.
+    Returns the row count.
+    """
+    table_name = clean_identifier(table_name)
+    columns = [clean_identifier(c[0]) for c in source.description]
+    first = source.fetchmany(batch_size)
+    if not first and not create_if_empty:
+        return 0
+    create_schema_if_not_exists(engine, schema)
+    create_table_with_columns(engine, schema, table_name, columns, infer_column_types(source.description, first))
+
+    def batches():
+        rows = first
+        while rows:
+            if on_batch:
+                on_batch(rows)
+            yield rows
+            rows = source.fetchmany(batch_size)
+
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        if if_exists == 'replace':
+            # Rows go into an UNLOGGED copy (no per-row WAL), all in one transaction
+            staging = f"{table_name[:40]}__load_{uuid.uuid4().hex[:8]}"
+            target = f'"{schema}"."{table_name}"'
+            cursor.execute(f'CREATE UNLOGGED TABLE "{schema}"."{staging}" (LIKE {target} INCLUDING ALL)')
+            row_count = copy_rows(cursor, schema, staging, columns, batches())
+            if not keep_table:
+                cursor.execute(HAS_DEPENDENTS_SQL, {'rel': target})
+                keep_table = cursor.fetchone()[0]
+            if keep_table:
+                cursor.execute(f'DELETE FROM {target}')
+                cursor.execute(f'INSERT INTO {target} SELECT * FROM "{schema}"."{staging}"')
+                cursor.execute(f'DROP TABLE "{schema}"."{staging}"')
+            else:
+                cursor.execute(TABLE_ACL_SQL, {'rel': target, 'new': f'"{schema}"."{staging}"'})
+                restore = [row[0] for row in cursor.fetchall()]
+                cursor.execute(f'ALTER TABLE "{schema}"."{staging}" SET LOGGED')
+                for statement in restore:
+                    cursor.execute(statement)
+                cursor.execute(f'DROP TABLE {target}')
+                cursor.execute(f'ALTER TABLE "{schema}"."{staging}" RENAME TO "{table_name}"')
+        else:
+            row_count = copy_rows(cursor, schema, table_name, columns, batches())
+        raw.commit()
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+    logging.info(f"Copied {row_count} rows into {schema}.{table_name}")
+    return row_count
+
 def validate_row_count(engine, schema, table_name, expected_count):
     with engine.connect() as conn:
         result = conn.execute(text(f'SELECT COUNT(*) FROM "{schema}"."{table_name}"'))
@@ -0,0 +1,18 @@
+"""Entry point for hybrid_sync runs in a forkserver child (RUN_SYNC_IN_SUBPROCESS=1)."""
+import os
+import sys
+import logging
+
+def run_sync_child(server, database, log_path=None):
+    """Run one hybrid sync with all output sent to log_path (discarded if None)."""
+    out = open(log_path or os.devnull, "a", buffering=1)
+    # Before importing hybrid_sync, so its StreamHandler binds to the log file
+    sys.stdout = sys.stderr = out
+    try:
+        from hybrid_sync import main
+        main(server=server, database=database)
+    except Exception:
+        logging.exception(f"[SYNC] {server}/{database} failed")
+        raise
+    finally:
+        out.flush()
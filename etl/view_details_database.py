@@ -1,4 +1,5 @@
 import pyodbc
+from connections import build_conn_str, connect, get_conn
 
 SQL_SERVERS = {
     "server1": {
@@ -8,33 +9,62 @@ SQL_SERVERS = {
     }
 }
 
+def _conn_str(db_name=None):
+    return build_conn_str(SQL_SERVERS["server1"], db_name)
+
 def get_connection(db_name=None):
-    server_info = SQL_SERVERS["server1"]
-    conn_str = (
-        f"DRIVER={{ODBC Driver 18 for SQL Server}};"
-        f"SERVER={server_info['server']};"
-        f"UID={server_info['username']};"
-        f"PWD={server_info['password']};"
-        "TrustServerCertificate=yes;"
-    )
-    if db_name:
-        conn_str += f"Database={db_name};"
-    return pyodbc.connect(conn_str, timeout=5)
+    return connect(_conn_str(db_name), timeout=5)
+
+def _pooled(db_name=None):
+    """Warm connection from the shared pool, one pool per (server, database)."""
+    return get_conn(f"server1/{db_name or 'master'}", _conn_str(db_name))
 
 
 def list_all_databases():
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT name FROM sys.databases WHERE database_id > 4")  # exclude system DBs
-    databases = [row[0] for row in cursor.fetchall()]
-    conn.close()
+    with _pooled() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sys.databases WHERE database_id > 4")  # exclude system DBs
+        databases = [row[0] for row in cursor.fetchall()]
     return databases
 
 
 def get_database_details(db_name):
-    conn = get_connection(db_name)
+    with _pooled(db_name) as conn:
+        return _database_details(conn)
+
+
+def _database_details(conn):
     cursor = conn.cursor()
 
+    # Row counts and sizes of every table from the catalog in one query, instead of
+    # a COUNT(*) scan plus a size query per table
+    try:
+        cursor.execute("""
+            SELECT t.name,
+                   SUM(CASE WHEN p.index_id IN (0, 1) THEN p.row_count ELSE 0 END) AS row_count,
+                   CAST(SUM(p.reserved_page_count) * 8.0 / 1024 AS DECIMAL(10,2)) AS size_mb
+            FROM sys.tables t
+            LEFT JOIN sys.dm_db_partition_stats p ON p.object_id = t.object_id
+            GROUP BY t.object_id, t.name
+            ORDER BY t.name
+        """)
+        table_info = [
+            {"table_name": name, "rows": row_count or 0, "size_mb": size_mb or 0}
+            for name, row_count, size_mb in cursor.fetchall()
+        ]
+    except pyodbc.Error:
+        # dm_db_partition_stats needs VIEW DATABASE STATE
+        table_info = _database_details_per_table(cursor)
+
+    # Object count
+    cursor.execute("SELECT COUNT(*) FROM sys.objects")
+    object_count = cursor.fetchone()[0]
+
+    return table_info, object_count
+
+
+def _database_details_per_table(cursor):
+    """Fallback without catalog stats access: count and size each table separately."""
     # Get all tables
     cursor.execute("SELECT t.name FROM sys.tables t ORDER BY t.name")
     tables = [row[0] for row in cursor.fetchall()]
@@ -62,9 +92,4 @@ def get_database_details(db_name):
             "size_mb": size_mb
         })
 
-    # Object count
-    cursor.execute("SELECT COUNT(*) FROM sys.objects")
-    object_count = cursor.fetchone()[0]
-
-    conn.close()
-    return table_info, object_count
+    return table_info
@@ -0,0 +1,4 @@
+"""WSGI entry point: gunicorn -w 1 -k gthread --threads 16 wsgi:application (run from etl/)."""
+from app import app as application
+
+app = application